@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Union, Set
+from typing import Dict, Optional, Union, Set
 from pathlib import Path
 import pandas as pd
 from pandas import DataFrame
@@ -44,6 +44,26 @@ class BaseDBManager(ABC):
         """
         pass
     
+    @abstractmethod
+    def replace_rows(
+        self,
+        frames: Dict[str, DataFrame],
+        key: str = 'hash',
+        chunk_size: int = 5000
+    ) -> bool:
+        """
+        Upload DataFrames to several tables atomically, replacing rows with the same key.
+
+        Args:
+            frames: Mapping of table name to the DataFrame to upload
+            key: Column identifying a row
+            chunk_size: Number of rows to insert at once
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        pass
+    
     @abstractmethod
     def upload_csv(
         self,
@@ -1,8 +1,8 @@
-from typing import Optional, Union, Set
+from typing import Optional, Union, Set, Dict, List, Iterator
 from pathlib import Path
 
 import pandas as pd
-from sqlalchemy import create_engine, text, Engine
+from sqlalchemy import create_engine, text, bindparam, Engine
 from sqlalchemy.exc import SQLAlchemyError
 from pandas import DataFrame
 
@@ -34,6 +34,7 @@ class PostgresManager(BaseDBManager):
             f'postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}'
         )
         self.engine: Optional[Engine] = None
+        self._checkpoint_tables: Set[str] = set()
 
     def connect(self) -> None:
         """Establish database connection."""
@@ -129,6 +130,77 @@ class PostgresManager(BaseDBManager):
             logger.error(f"Error uploading data to table {table_name}: {str(e)}")
             return False
 
+    def replace_rows(
+        self,
+        frames: Dict[str, DataFrame],
+        key: str = 'hash',
+        chunk_size: int = 5000
+    ) -> bool:
+        """
+        Upload DataFrames to several tables in a single database transaction.
+
+        Existing rows whose key is among the uploaded ones are deleted first,
+        so uploading the same rows again does not create duplicates, and a
+        failure leaves none of the tables changed.
+
+        Args:
+            frames: Mapping of table name to the DataFrame to upload
+            key: Column identifying a row
+            chunk_size: Number of rows (and keys per delete) sent at once
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        frames = {name: df for name, df in frames.items() if not df.empty}
+        if not frames:
+            return True
+
+        try:
+            engine = self._get_engine()
+
+            existing_tables = set()
+            with engine.connect() as connection:
+                for table_name in frames:
+                    exists = connection.execute(text(
+                        f"""
+                        SELECT EXISTS (
+                            SELECT FROM information_schema.tables 
+                            WHERE table_name = '{table_name}'
+                        )
+                        """
+                    )).scalar()
+                    if exists:
+                        existing_tables.add(table_name)
+
+            for table_name in existing_tables:
+                self._add_missing_columns(frames[table_name], table_name)
+
+            with engine.begin() as connection:
+                for table_name, df in frames.items():
+                    if table_name in existing_tables:
+                        keys = df[key].dropna().astype(str).unique().tolist()
+                        delete = text(
+                            f'DELETE FROM {table_name} WHERE "{key}" IN :keys'
+                        ).bindparams(bindparam('keys', expanding=True))
+                        for i in range(0, len(keys), chunk_size):
+                            connection.execute(delete, {'keys': keys[i:i + chunk_size]})
+
+                    df.to_sql(
+                        name=table_name,
+                        con=connection,
+                        if_exists='append',
+                        index=False,
+                        chunksize=chunk_size,
+                        method='multi'
+                    )
+
+            logger.info(f"Successfully uploaded data to tables: {', '.join(frames)}")
+            return True
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error uploading data to tables {', '.join(frames)}: {str(e)}")
+            return False
+
     def upload_csv(
         self,
         file_path: Union[str, Path],
@@ -183,4 +255,174 @@ class PostgresManager(BaseDBManager):
                 
         except SQLAlchemyError as e:
             logger.error(f"Error getting processed addresses: {str(e)}")
-            return set()
\ No newline at end of file
+            return set()
+
+    def get_last_lts(
+        self,
+        addresses: List[str],
+        table_name: str = 'transactions'
+    ) -> Dict[str, int]:
+        """
+        Get the highest stored logical time for each of the given addresses.
+
+        Args:
+            addresses: Account addresses in the form stored in account_address
+            table_name: Name of the transactions table
+
+        Returns:
+            Mapping of address to its last stored lt; addresses without rows are omitted
+        """
+        if not addresses:
+            return {}
+
+        try:
+            engine = self._get_engine()
+            query = f"""
+            SELECT account_address, MAX(CAST(lt AS BIGINT))
+            FROM {table_name}
+            WHERE account_address IN :addresses
+            GROUP BY account_address
+            """
+
+            with engine.connect() as connection:
+                result = connection.execute(
+                    text(query).bindparams(bindparam('addresses', expanding=True)),
+                    {'addresses': list(addresses)}
+                )
+                return {row[0]: int(row[1]) for row in result}
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting last lts: {str(e)}")
+            return {}
+
+    def get_counterparty_edges(
+        self,
+        table_name: str = 'out_msgs',
+        chunk_size: int = 1_000_000
+    ) -> Iterator[DataFrame]:
+        """
+        Get out messages aggregated by source and destination address.
+
+        Args:
+            table_name: Name of the out messages table
+            chunk_size: Number of edges per returned chunk
+
+        Yields:
+            DataFrames with source_address, destination_address, count and volume (in TON) columns
+        """
+        try:
+            engine = self._get_engine()
+            query = f"""
+            SELECT
+                source_address,
+                destination_address,
+                COUNT(*) AS count,
+                COALESCE(SUM(CAST(value AS NUMERIC)), 0) / 1e9 AS volume
+            FROM {table_name}
+            WHERE source_address IS NOT NULL AND destination_address IS NOT NULL
+            GROUP BY source_address, destination_address
+            """
+
+            with engine.connect().execution_options(stream_results=True) as connection:
+                yield from pd.read_sql(text(query), connection, chunksize=chunk_size)
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting counterparty edges: {str(e)}")
+            return
+
+    def get_block_checkpoint(
+        self,
+        range_start: int,
+        range_end: int,
+        table_name: str = 'block_checkpoints'
+    ) -> Optional[int]:
+        """
+        Get the last processed masterchain seqno of a block range.
+
+        Args:
+            range_start: First masterchain seqno of the range
+            range_end: Masterchain seqno after the last one of the range
+            table_name: Name of the checkpoints table
+
+        Returns:
+            Last processed seqno, or None if the range has not been started
+        """
+        try:
+            engine = self._get_engine()
+            self._create_block_checkpoints_table(table_name)
+            query = f"""
+            SELECT last_seqno
+            FROM {table_name}
+            WHERE range_start = :range_start AND range_end = :range_end
+            """
+
+            with engine.connect() as connection:
+                return connection.execute(
+                    text(query),
+                    {'range_start': range_start, 'range_end': range_end}
+                ).scalar()
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting block checkpoint: {str(e)}")
+            return None
+
+    def save_block_checkpoint(
+        self,
+        range_start: int,
+        range_end: int,
+        last_seqno: int,
+        table_name: str = 'block_checkpoints'
+    ) -> bool:
+        """
+        Store the last processed masterchain seqno of a block range.
+
+        Args:
+            range_start: First masterchain seqno of the range
+            range_end: Masterchain seqno after the last one of the range
+            last_seqno: Last processed masterchain seqno
+            table_name: Name of the checkpoints table
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            engine = self._get_engine()
+            self._create_block_checkpoints_table(table_name)
+            query = f"""
+            INSERT INTO {table_name} (range_start, range_end, last_seqno, updated_at)
+            VALUES (:range_start, :range_end, :last_seqno, NOW())
+            ON CONFLICT (range_start, range_end)
+            DO UPDATE SET last_seqno = EXCLUDED.last_seqno, updated_at = EXCLUDED.updated_at
+            """
+
+            with engine.connect() as connection:
+                connection.execute(
+                    text(query),
+                    {'range_start': range_start, 'range_end': range_end, 'last_seqno': last_seqno}
+                )
+                connection.commit()
+            return True
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error saving block checkpoint: {str(e)}")
+            return False
+
+    def _create_block_checkpoints_table(self, table_name: str) -> None:
+        """Create the block checkpoints table if it doesn't exist."""
+        if table_name in self._checkpoint_tables:
+            return
+
+        with self._get_engine().connect() as connection:
+            connection.execute(text(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table_name} (
+                    range_start BIGINT NOT NULL,
+                    range_end BIGINT NOT NULL,
+                    last_seqno BIGINT NOT NULL,
+                    updated_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (range_start, range_end)
+                )
+                """
+            ))
+            connection.commit()
+        self._checkpoint_tables.add(table_name)
\ No newline at end of file
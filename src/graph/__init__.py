@@ -0,0 +1,3 @@
+from .index import CounterpartyGraph
+
+__all__ = ['CounterpartyGraph']
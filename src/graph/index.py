@@ -0,0 +1,402 @@
+import os
+from typing import Dict, Iterable, List, Optional, Union
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from ..utils import logger
+
+class CounterpartyGraph:
+    """
+    Directed counterparty graph built from out messages.
+
+    Each edge source -> destination aggregates the number of messages and their
+    total value in TON. Addresses are mapped to integer ids and edges are kept
+    in CSR arrays (indptr, indices, counts, volumes) that can be saved to disk
+    and memory-mapped back. Newly added edges go to a small COO delta that is
+    taken into account by queries and merged into CSR by compact().
+    """
+
+    ARRAYS = ('indptr', 'indices', 'counts', 'volumes')
+
+    def __init__(self, max_delta_edges: int = 1_000_000):
+        """
+        Args:
+            max_delta_edges: Number of pending edges that triggers compaction
+        """
+        self.max_delta_edges = max_delta_edges
+
+        self._addresses: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.volumes = np.zeros(0, dtype=np.float64)
+        self.in_volume = np.zeros(0, dtype=np.float64)
+
+        self._delta_src: List[np.ndarray] = []
+        self._delta_dst: List[np.ndarray] = []
+        self._delta_counts: List[np.ndarray] = []
+        self._delta_volumes: List[np.ndarray] = []
+        self._delta_size = 0
+        self._reverse: Optional[tuple] = None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self._addresses)
+
+    @property
+    def num_edges(self) -> int:
+        """Number of edges, counting pending edges not yet merged with existing ones."""
+        return len(self.indices) + self._delta_size
+
+    def _get_ids(self, addresses: Iterable[str]) -> np.ndarray:
+        """Map addresses to ids, registering unknown addresses."""
+        codes, uniques = pd.factorize(pd.Series(addresses, dtype=object))
+        unique_ids = np.empty(len(uniques), dtype=np.int64)
+        for i, address in enumerate(uniques):
+            node_id = self._ids.get(address)
+            if node_id is None:
+                node_id = len(self._addresses)
+                self._ids[address] = node_id
+                self._addresses.append(address)
+            unique_ids[i] = node_id
+        return unique_ids[codes]
+
+    def node_id(self, address: str) -> Optional[int]:
+        return self._ids.get(address)
+
+    def add_edges(
+        self,
+        sources: Iterable[str],
+        destinations: Iterable[str],
+        volumes: Iterable[float],
+        counts: Optional[Iterable[int]] = None
+    ) -> None:
+        """
+        Add edges to the graph.
+
+        Args:
+            sources: Source addresses
+            destinations: Destination addresses
+            volumes: Transferred value in TON of each edge
+            counts: Number of messages of each edge, 1 per edge if omitted
+        """
+        src = self._get_ids(sources)
+        dst = self._get_ids(destinations)
+        vol = pd.Series(volumes, dtype=np.float64).to_numpy()
+        if counts is None:
+            cnt = np.ones(len(src), dtype=np.int64)
+        else:
+            cnt = pd.Series(counts, dtype=np.int64).to_numpy()
+
+        if len(src) == 0:
+            return
+
+        if len(self.in_volume) < self.num_nodes:
+            self.in_volume = np.concatenate(
+                [self.in_volume, np.zeros(self.num_nodes - len(self.in_volume))]
+            )
+        np.add.at(self.in_volume, dst, vol)
+
+        self._delta_src.append(src)
+        self._delta_dst.append(dst)
+        self._delta_counts.append(cnt)
+        self._delta_volumes.append(vol)
+        self._delta_size += len(src)
+
+        if self._delta_size >= self.max_delta_edges:
+            self.compact()
+
+    def add_out_msgs(self, out_msgs_df: DataFrame) -> None:
+        """Add edges from an out_msgs dataframe as prepared by TransactionLoader."""
+        required = {'source_address', 'destination_address', 'value'}
+        if out_msgs_df.empty or not required.issubset(out_msgs_df.columns):
+            return
+
+        df = out_msgs_df.dropna(subset=['source_address', 'destination_address'])
+        self.add_edges(
+            df['source_address'],
+            df['destination_address'],
+            pd.to_numeric(df['value'], errors='coerce').fillna(0).to_numpy() / 1e9
+        )
+
+    def _delta(self) -> tuple:
+        """Pending edges as concatenated COO arrays."""
+        if len(self._delta_src) > 1:
+            self._delta_src = [np.concatenate(self._delta_src)]
+            self._delta_dst = [np.concatenate(self._delta_dst)]
+            self._delta_counts = [np.concatenate(self._delta_counts)]
+            self._delta_volumes = [np.concatenate(self._delta_volumes)]
+        if not self._delta_src:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty, np.zeros(0, dtype=np.float64)
+        return self._delta_src[0], self._delta_dst[0], self._delta_counts[0], self._delta_volumes[0]
+
+    def compact(self) -> None:
+        """Merge pending edges into the CSR arrays, aggregating duplicate edges."""
+        if not self._delta_size and len(self.indptr) == self.num_nodes + 1:
+            return
+
+        delta_src, delta_dst, delta_counts, delta_volumes = self._delta()
+        csr_src = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr))
+
+        src = np.concatenate([csr_src, delta_src])
+        dst = np.concatenate([self.indices.astype(np.int64), delta_dst])
+        counts = np.concatenate([self.counts, delta_counts])
+        volumes = np.concatenate([self.volumes, delta_volumes])
+
+        order = np.lexsort((dst, src))
+        src, dst, counts, volumes = src[order], dst[order], counts[order], volumes[order]
+
+        if len(src):
+            starts = np.flatnonzero(
+                np.concatenate([[True], (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])])
+            )
+            src, dst = src[starts], dst[starts]
+            counts = np.add.reduceat(counts, starts)
+            volumes = np.add.reduceat(volumes, starts)
+
+        index_dtype = np.int32 if self.num_nodes < np.iinfo(np.int32).max else np.int64
+        self.indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(src, minlength=self.num_nodes))]
+        ).astype(np.int64)
+        self.indices = dst.astype(index_dtype)
+        self.counts = counts
+        self.volumes = volumes
+
+        self._delta_src, self._delta_dst, self._delta_counts, self._delta_volumes = [], [], [], []
+        self._delta_size = 0
+        self._reverse = None
+        logger.info(f"Compacted counterparty graph: {self.num_nodes} nodes, {len(self.indices)} edges")
+
+    def _reverse_csr(self) -> tuple:
+        """CSR arrays of the transposed graph, built on first use."""
+        if self._reverse is None:
+            n = len(self.indptr) - 1
+            csr_src = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind='stable')
+            indptr = np.concatenate(
+                [[0], np.cumsum(np.bincount(self.indices, minlength=n))]
+            ).astype(np.int64)
+            self._reverse = (indptr, csr_src[order], self.counts[order], self.volumes[order])
+        return self._reverse
+
+    def _neighbors(self, nodes: np.ndarray, direction: str = 'out') -> tuple:
+        """
+        Neighbors of a set of nodes.
+
+        Returns:
+            Tuple of (node, neighbor, count, volume) arrays, one entry per edge
+        """
+        if direction == 'out':
+            indptr, indices, counts, volumes = self.indptr, self.indices, self.counts, self.volumes
+        elif direction == 'in':
+            indptr, indices, counts, volumes = self._reverse_csr()
+        else:
+            raise ValueError(f"Unknown direction: {direction}")
+
+        csr_nodes = nodes[nodes < len(indptr) - 1]
+        starts, ends = indptr[csr_nodes], indptr[csr_nodes + 1]
+        lengths = ends - starts
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        positions = offsets + np.arange(lengths.sum())
+
+        node_parts = [np.repeat(csr_nodes, lengths)]
+        neighbor_parts = [indices[positions].astype(np.int64)]
+        count_parts = [counts[positions]]
+        volume_parts = [volumes[positions]]
+
+        if self._delta_size:
+            delta_src, delta_dst, delta_counts, delta_volumes = self._delta()
+            if direction == 'in':
+                delta_src, delta_dst = delta_dst, delta_src
+            mask = np.isin(delta_src, nodes)
+            node_parts.append(delta_src[mask])
+            neighbor_parts.append(delta_dst[mask])
+            count_parts.append(delta_counts[mask])
+            volume_parts.append(delta_volumes[mask])
+
+        return (
+            np.concatenate(node_parts),
+            np.concatenate(neighbor_parts),
+            np.concatenate(count_parts),
+            np.concatenate(volume_parts)
+        )
+
+    def k_hop(
+        self,
+        address: str,
+        k: int,
+        direction: str = 'out',
+        min_in_volume: Optional[float] = None
+    ) -> DataFrame:
+        """
+        Breadth-first search up to k hops from an address.
+
+        Args:
+            address: Start address
+            k: Maximum number of hops
+            direction: 'out' to follow sent messages, 'in' to follow received ones
+            min_in_volume: Keep only addresses that received more than this many TON in total
+
+        Returns:
+            DataFrame with address, hops and in_volume columns, sorted by hops
+        """
+        start = self.node_id(address)
+        if start is None:
+            return pd.DataFrame(columns=['address', 'hops', 'in_volume'])
+
+        hops = np.full(self.num_nodes, -1, dtype=np.int32)
+        hops[start] = 0
+        frontier = np.array([start], dtype=np.int64)
+
+        for hop in range(1, k + 1):
+            if not len(frontier):
+                break
+            _, neighbors, _, _ = self._neighbors(frontier, direction)
+            neighbors = np.unique(neighbors)
+            frontier = neighbors[hops[neighbors] < 0]
+            hops[frontier] = hop
+
+        reached = np.flatnonzero(hops > 0)
+        if min_in_volume is not None:
+            reached = reached[self.in_volume[reached] > min_in_volume]
+        reached = reached[np.argsort(hops[reached], kind='stable')]
+
+        return pd.DataFrame({
+            'address': [self._addresses[i] for i in reached],
+            'hops': hops[reached],
+            'in_volume': self.in_volume[reached]
+        })
+
+    def top_counterparties(
+        self,
+        address: str,
+        n: int = 10,
+        direction: str = 'out',
+        by: str = 'volume'
+    ) -> DataFrame:
+        """
+        Largest counterparties of an address.
+
+        Args:
+            address: Address to look up
+            n: Number of counterparties to return
+            direction: 'out' for recipients, 'in' for senders
+            by: Sort by 'volume' or 'count'
+
+        Returns:
+            DataFrame with address, count and volume columns
+        """
+        node = self.node_id(address)
+        if node is None:
+            return pd.DataFrame(columns=['address', 'count', 'volume'])
+
+        _, neighbors, counts, volumes = self._neighbors(np.array([node], dtype=np.int64), direction)
+        df = pd.DataFrame({'node': neighbors, 'count': counts, 'volume': volumes})
+        df = df.groupby('node', as_index=False).sum().nlargest(n, by)
+        df.insert(0, 'address', [self._addresses[i] for i in df['node']])
+        return df.drop(columns='node').reset_index(drop=True)
+
+    def connected_components(self) -> np.ndarray:
+        """
+        Weakly connected component label of every node.
+
+        Returns:
+            Array where position i holds the component label of node i
+        """
+        self.compact()
+        src = np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(self.indptr))
+        dst = self.indices.astype(np.int64)
+        labels = np.arange(self.num_nodes, dtype=np.int64)
+
+        while True:
+            previous = labels.copy()
+            edge_labels = np.minimum(labels[src], labels[dst])
+            np.minimum.at(labels, src, edge_labels)
+            np.minimum.at(labels, dst, edge_labels)
+            # Pointer jumping to shortcut long label chains
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+            if np.array_equal(labels, previous):
+                return labels
+
+    def component_members(self, address: str) -> List[str]:
+        """Addresses in the same weakly connected component as the given address."""
+        node = self.node_id(address)
+        if node is None:
+            return []
+        labels = self.connected_components()
+        return [self._addresses[i] for i in np.flatnonzero(labels == labels[node])]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Compact the graph and save it as .npy files in a directory."""
+        self.compact()
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        arrays = {'addresses': np.array(self._addresses, dtype=str), 'in_volume': self.in_volume}
+        arrays.update({name: getattr(self, name) for name in self.ARRAYS})
+        for name, array in arrays.items():
+            # Write to a temporary file and rename it, so arrays memory-mapped
+            # from the same directory stay valid while they are written out
+            tmp_path = path / f'{name}.npy.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path / f'{name}.npy')
+        logger.info(f"Saved counterparty graph to {path}")
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        mmap: bool = True,
+        max_delta_edges: int = 1_000_000
+    ) -> 'CounterpartyGraph':
+        """
+        Load a graph saved with save().
+
+        Args:
+            path: Directory with the saved arrays
+            mmap: Memory-map the edge arrays instead of reading them into memory
+            max_delta_edges: Number of pending edges that triggers compaction
+        """
+        path = Path(path)
+        mmap_mode = 'r' if mmap else None
+        graph = cls(max_delta_edges=max_delta_edges)
+
+        graph._addresses = np.load(path / 'addresses.npy').tolist()
+        graph._ids = {address: i for i, address in enumerate(graph._addresses)}
+        graph.in_volume = np.load(path / 'in_volume.npy')
+        for name in cls.ARRAYS:
+            setattr(graph, name, np.load(path / f'{name}.npy', mmap_mode=mmap_mode))
+
+        logger.info(f"Loaded counterparty graph: {graph.num_nodes} nodes, {len(graph.indices)} edges")
+        return graph
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[DataFrame], max_delta_edges: int = 1_000_000) -> 'CounterpartyGraph':
+        """
+        Build a graph from aggregated edge chunks.
+
+        Args:
+            edges: DataFrames with source_address, destination_address, count and volume columns
+            max_delta_edges: Number of pending edges that triggers compaction
+        """
+        graph = cls(max_delta_edges=max_delta_edges)
+        for chunk in edges:
+            graph.add_edges(
+                chunk['source_address'],
+                chunk['destination_address'],
+                chunk['volume'].astype(float),
+                chunk['count']
+            )
+        graph.compact()
+        return graph
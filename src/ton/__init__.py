@@ -1,6 +1,28 @@
 from .explorer import TonExplorer
+from .toncenter import ToncenterExplorer
+from .composite import CompositeExplorer
 from .loader import TransactionLoader
+from .streamer import TransactionStreamer
+from .block_loader import BlockRangeLoader
 from .run_loader import run_loader
-from .exceptions import TonAPIError, TonDataError
+from .exceptions import (
+    TonAPIError,
+    TonClientError,
+    TonRateLimitError,
+    TonCircuitOpenError,
+    TonDataError
+)
 
-__all__ = ['TonExplorer', 'TransactionLoader', 'TonAPIError', 'TonDataError']
\ No newline at end of file
+__all__ = [
+    'TonExplorer',
+    'ToncenterExplorer',
+    'CompositeExplorer',
+    'TransactionLoader',
+    'TransactionStreamer',
+    'BlockRangeLoader',
+    'TonAPIError',
+    'TonClientError',
+    'TonRateLimitError',
+    'TonCircuitOpenError',
+    'TonDataError'
+]
\ No newline at end of file
@@ -14,9 +14,10 @@ class BlockchainExplorer(ABC):
     async def get_account_transactions(
         self, 
         address: str, 
-        limit: int = 100
+        limit: int = 100,
+        after_lt: int = 0
     ) -> pd.DataFrame:
-        """Get account transactions."""
+        """Get account transactions with logical time greater than after_lt."""
         pass
     
     @abstractmethod
@@ -0,0 +1,104 @@
+from typing import List, Tuple
+import asyncio
+import pandas as pd
+
+from .loader import TransactionLoader
+from .exceptions import TonDataError
+from ..utils import logger
+
+class BlockRangeLoader:
+    """
+    Class for loading all transactions of a masterchain seqno range.
+
+    The range is split into sub-ranges that are processed concurrently. For every
+    masterchain block the shard blocks it commits are fetched as well, and the
+    transactions of all of them are stored through TransactionLoader. Progress is
+    checkpointed per sub-range, so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        loader: TransactionLoader,
+        range_size: int = 100,
+        concurrency: int = 8,
+        block_concurrency: int = 8
+    ):
+        """
+        Args:
+            loader: Loader whose explorer and database are used
+            range_size: Number of masterchain blocks per checkpointed sub-range
+            concurrency: Number of sub-ranges processed at the same time
+            block_concurrency: Number of blocks fetched at the same time within a masterchain block
+        """
+        self.loader = loader
+        self.explorer = loader.explorer
+        self.db = loader.db
+        self.range_size = range_size
+        self.concurrency = concurrency
+        self.block_semaphore = asyncio.Semaphore(block_concurrency)
+
+    def split_range(self, start_seqno: int, end_seqno: int) -> List[Tuple[int, int]]:
+        """Split [start_seqno, end_seqno) into sub-ranges of range_size blocks."""
+        return [
+            (range_start, min(range_start + self.range_size, end_seqno))
+            for range_start in range(start_seqno, end_seqno, self.range_size)
+        ]
+
+    async def _fetch_block_transactions(self, block: dict) -> pd.DataFrame:
+        async with self.block_semaphore:
+            return await self.explorer.get_block_transactions(
+                block['workchain_id'], block['shard'], block['seqno']
+            )
+
+    async def fetch_masterchain_block(self, seqno: int) -> pd.DataFrame:
+        """Fetch transactions of a masterchain block and the shard blocks it commits."""
+        blocks = await self.explorer.get_masterchain_blocks(seqno)
+        frames = await asyncio.gather(*[self._fetch_block_transactions(block) for block in blocks])
+        frames = [df for df in frames if not df.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    async def process_range(self, range_start: int, range_end: int) -> None:
+        """Process masterchain blocks [range_start, range_end), resuming from the checkpoint."""
+        checkpoint = await asyncio.to_thread(self.db.get_block_checkpoint, range_start, range_end)
+        first_seqno = checkpoint + 1 if checkpoint is not None else range_start
+
+        if first_seqno >= range_end:
+            logger.info(f"Block range {range_start}-{range_end} already processed")
+            return
+
+        try:
+            tx_count = 0
+            for seqno in range(first_seqno, range_end):
+                transactions_df = await self.fetch_masterchain_block(seqno)
+                # Database writes run in a thread so other ranges keep fetching meanwhile;
+                # the checkpoint only advances once the block has been stored
+                if not transactions_df.empty:
+                    await asyncio.to_thread(self.loader.store_transactions, transactions_df)
+                    tx_count += len(transactions_df)
+                await asyncio.to_thread(self.db.save_block_checkpoint, range_start, range_end, seqno)
+
+            logger.info(f"Processed {tx_count} transactions for block range {range_start}-{range_end}")
+
+        except Exception as e:
+            logger.error(f"Error processing block range {range_start}-{range_end}: {str(e)}")
+            raise TonDataError(f"Failed to process block range {range_start}-{range_end}: {str(e)}")
+
+    async def process_blocks(self, start_seqno: int, end_seqno: int) -> None:
+        """Process all masterchain blocks in [start_seqno, end_seqno)."""
+        ranges = self.split_range(start_seqno, end_seqno)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(range_start: int, range_end: int) -> None:
+            async with semaphore:
+                await self.process_range(range_start, range_end)
+
+        results = await asyncio.gather(
+            *[run(range_start, range_end) for range_start, range_end in ranges],
+            return_exceptions=True
+        )
+
+        failed = [r for r, result in zip(ranges, results) if isinstance(result, Exception)]
+        if failed:
+            raise TonDataError(f"Failed to process {len(failed)}/{len(ranges)} block ranges: {failed}")
+
+        logger.info(f"Processed {len(ranges)} block ranges from {start_seqno} to {end_seqno}")
@@ -0,0 +1,232 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Sequence, Deque
+import pandas as pd
+
+from .base import BlockchainExplorer
+from .exceptions import TonAPIError, TonClientError
+from ..utils.logging import logger
+
+class _ProviderStats:
+    """Rolling latency and failure statistics for a single provider."""
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.last_failure_at = 0.0
+
+    def record_latency(self, latency: float) -> None:
+        self.latencies.append(latency)
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self.last_failure_at = time.monotonic()
+
+    def recent_failures(self, cooldown: float) -> int:
+        """Consecutive failures, forgotten once the last one is older than cooldown seconds."""
+        if time.monotonic() - self.last_failure_at >= cooldown:
+            return 0
+        return self.consecutive_failures
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class CompositeExplorer(BlockchainExplorer):
+    """
+    Explorer that routes requests across several providers.
+
+    Providers are tried in order of health (fewest recent consecutive failures,
+    then lowest median latency). Failures are forgotten after failure_cooldown
+    seconds, so a demoted provider is tried first again once it has had time
+    to recover. A failing provider is skipped in favour of the
+    next one; client errors such as 404 are raised as is, since every provider
+    would give the same answer. Calls that map to a single API request are also hedged: when a
+    provider is slower than its own per-request latency quantile (p95 by
+    default) a duplicate request is sent to the next provider, the first
+    successful response wins and the others are cancelled. Paginated calls
+    are only failed over, since their duration depends on the amount of data.
+
+    Latency is measured per HTTP request through the providers'
+    latency_listeners hook when available, and per call otherwise.
+    """
+
+    # Methods served by a single API request, safe to hedge
+    SINGLE_REQUEST_METHODS = frozenset({
+        'get_account_info',
+        'get_transaction_info',
+        'get_masterchain_blocks'
+    })
+
+    def __init__(
+        self,
+        providers: Sequence[BlockchainExplorer],
+        hedge_quantile: float = 0.95,
+        hedge_delay: float = 2.0,
+        max_hedges: int = 1,
+        min_samples: int = 20,
+        latency_window: int = 200,
+        failure_cooldown: float = 60.0
+    ):
+        """
+        Args:
+            providers: Explorers to route requests across, in preference order
+            hedge_quantile: Per-request latency quantile after which a hedged request is sent
+            hedge_delay: Hedge delay in seconds used until enough samples are collected
+            max_hedges: Maximum number of hedged requests per single-request call
+            min_samples: Number of latency samples required before using the quantile
+            latency_window: Number of recent latency samples kept per provider
+            failure_cooldown: Seconds after the last failure before a provider is ranked by latency again
+        """
+        if not providers:
+            raise ValueError("At least one provider is required")
+
+        self.providers = list(providers)
+        self.hedge_quantile = hedge_quantile
+        self.hedge_delay = hedge_delay
+        self.max_hedges = max_hedges
+        self.min_samples = min_samples
+        self.failure_cooldown = failure_cooldown
+        self._stats = {id(p): _ProviderStats(latency_window) for p in self.providers}
+
+        for provider in self.providers:
+            if hasattr(provider, 'latency_listeners'):
+                provider.latency_listeners.append(self._stats[id(provider)].record_latency)
+
+    def _ordered_providers(self) -> List[BlockchainExplorer]:
+        """Providers sorted by health, keeping the configured order on ties."""
+        def key(provider: BlockchainExplorer):
+            stats = self._stats[id(provider)]
+            median = stats.quantile(0.5)
+            return (stats.recent_failures(self.failure_cooldown), median if median is not None else 0.0)
+        return sorted(self.providers, key=key)
+
+    def _hedge_after(self, provider: BlockchainExplorer) -> float:
+        """Seconds to wait for a provider before sending a hedged request."""
+        stats = self._stats[id(provider)]
+        if len(stats.latencies) < self.min_samples:
+            return self.hedge_delay
+        return stats.quantile(self.hedge_quantile)
+
+    async def _timed_call(
+        self,
+        provider: BlockchainExplorer,
+        method: str,
+        *args,
+        **kwargs
+    ) -> Any:
+        """Call a provider method and record its outcome, and its latency if not reported per request."""
+        stats = self._stats[id(provider)]
+        start = time.perf_counter()
+        try:
+            result = await getattr(provider, method)(*args, **kwargs)
+        except (asyncio.CancelledError, TonClientError):
+            # A client error (e.g. 404) is an answer about the request, not the provider
+            raise
+        except Exception:
+            stats.record_failure()
+            raise
+        stats.record_success()
+        if not hasattr(provider, 'latency_listeners') and method in self.SINGLE_REQUEST_METHODS:
+            stats.record_latency(time.perf_counter() - start)
+        return result
+
+    async def _route(self, method: str, *args, **kwargs) -> Any:
+        """Route a call across providers with failover, hedging single-request calls."""
+        providers = self._ordered_providers()
+        pending: Dict[asyncio.Future, BlockchainExplorer] = {}
+        errors: List[str] = []
+        next_index = 0
+        hedges = 0
+        max_hedges = self.max_hedges if method in self.SINGLE_REQUEST_METHODS else 0
+
+        def launch() -> BlockchainExplorer:
+            nonlocal next_index
+            provider = providers[next_index]
+            next_index += 1
+            task = asyncio.ensure_future(self._timed_call(provider, method, *args, **kwargs))
+            pending[task] = provider
+            return provider
+
+        last_launched = launch()
+        try:
+            while pending:
+                can_hedge = next_index < len(providers) and hedges < max_hedges
+                timeout = self._hedge_after(last_launched) if can_hedge else None
+
+                done, _ = await asyncio.wait(
+                    pending.keys(),
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    hedges += 1
+                    logger.info(
+                        f"Hedging {method} on {type(providers[next_index]).__name__} "
+                        f"after {timeout:.2f}s"
+                    )
+                    last_launched = launch()
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    if isinstance(task.exception(), TonClientError):
+                        raise task.exception()
+                    errors.append(f"{type(provider).__name__}: {task.exception()}")
+                    logger.warning(
+                        f"Provider {type(provider).__name__} failed on {method}: {task.exception()}"
+                    )
+
+                if not pending and next_index < len(providers):
+                    last_launched = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise TonAPIError(f"All providers failed on {method}: {'; '.join(errors)}")
+
+    async def get_account_info(self, address: str) -> Dict[str, Any]:
+        """Get account information."""
+        return await self._route("get_account_info", address)
+
+    async def get_account_transactions(
+        self,
+        address: str,
+        limit: int = 1000,
+        after_lt: int = 0
+    ) -> pd.DataFrame:
+        """Get account transactions with logical time greater than after_lt."""
+        return await self._route(
+            "get_account_transactions", address, limit=limit, after_lt=after_lt
+        )
+
+    async def get_transaction_info(self, tx_hash: str) -> Dict[str, Any]:
+        """Get transaction details."""
+        return await self._route("get_transaction_info", tx_hash)
+
+    async def get_masterchain_blocks(self, seqno: int) -> List[Dict[str, Any]]:
+        """Get the masterchain block with the given seqno and the shard blocks it commits."""
+        return await self._route("get_masterchain_blocks", seqno)
+
+    async def get_block_transactions(
+        self,
+        workchain_id: int,
+        shard: str,
+        seqno: int
+    ) -> pd.DataFrame:
+        """Get all transactions of a block."""
+        return await self._route("get_block_transactions", workchain_id, shard, seqno)
+
+    def extract_transfers(self, transactions: List[Dict]) -> pd.DataFrame:
+        """Extract transfers from transactions."""
+        return self.providers[0].extract_transfers(transactions)
@@ -1,12 +1,42 @@
 # src/ton/exceptions.py
+from typing import Optional
+
 class TonError(Exception):
     """Base exception for TON-related errors"""
     pass
 
 class TonAPIError(TonError):
     """API-related errors"""
-    pass
+
+    def __init__(
+        self,
+        message: str = "",
+        status: Optional[int] = None,
+        retryable: bool = True
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+class TonClientError(TonAPIError):
+    """Request rejected by the API (4xx other than 429), not worth retrying"""
+
+    def __init__(self, message: str = "", status: Optional[int] = None):
+        super().__init__(message, status=status, retryable=False)
+
+class TonRateLimitError(TonAPIError):
+    """Request rate limited by the API (429)"""
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message, status=429, retryable=True)
+        self.retry_after = retry_after
+
+class TonCircuitOpenError(TonAPIError):
+    """Request not sent because the API circuit breaker is open"""
+
+    def __init__(self, message: str = ""):
+        super().__init__(message, retryable=False)
 
 class TonDataError(TonError):
     """Data processing errors"""
-    pass
\ No newline at end of file
+    pass
@@ -2,48 +2,165 @@ from datetime import datetime
 import aiohttp
 import pandas as pd
 import asyncio
+import json
 import random
+import time
 from pytoniq_core import Address
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from typing import Dict, Any, List, Optional
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential
+)
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable
 
 from .base import BlockchainExplorer
-from .exceptions import TonAPIError
+from .exceptions import TonAPIError, TonClientError, TonRateLimitError
+from .retry import (
+    RetryBudget,
+    CircuitBreaker,
+    get_retry_budget,
+    get_circuit_breaker,
+    parse_retry_after
+)
 from ..utils.logging import logger
+from ..utils.profiling import profile_stage
 
 class TonExplorer(BlockchainExplorer):
     """TON blockchain explorer implementation."""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://tonapi.io/v2",
+        timeout: float = 30.0,
+        max_attempts: int = 5,
+        backoff_max: float = 60.0,
+        retry_budget: Optional[RetryBudget] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Args:
+            api_key: API key
+            base_url: API base url
+            timeout: Total timeout of a single request attempt in seconds
+            max_attempts: Maximum number of attempts per request
+            backoff_max: Upper bound of the wait between attempts in seconds, including Retry-After
+            retry_budget: Retry budget, shared by the whole process by default
+            circuit_breaker: Circuit breaker, shared by explorers with the same base_url by default
+        """
         self.api_key = api_key
-        self.base_url = "https://tonapi.io/v2"
+        self.base_url = base_url.rstrip("/")
         self.headers = {
             "Accept": "application/json",
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_attempts = max_attempts
+        self.backoff_max = backoff_max
+        self.backoff = wait_random_exponential(multiplier=1, max=backoff_max)
+        self.retry_budget = retry_budget or get_retry_budget()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(self.base_url)
+        # Called with the latency in seconds of every successful request attempt
+        self.latency_listeners: List[Callable[[float], None]] = []
+
+    def _wait(self, retry_state: RetryCallState) -> float:
+        """Honor Retry-After on rate limits (capped at backoff_max), use jittered backoff otherwise."""
+        error = retry_state.outcome.exception()
+        if isinstance(error, TonRateLimitError) and error.retry_after is not None:
+            return min(error.retry_after, self.backoff_max)
+        return self.backoff(retry_state)
+
+    @staticmethod
+    async def _sleep(seconds: float) -> None:
+        """Wait between retry attempts, measured as its own profiling stage."""
+        with profile_stage("retry_wait"):
+            await asyncio.sleep(seconds)
+
+    def _budget_exhausted(self, retry_state: RetryCallState) -> bool:
+        """Stop retrying once the process-wide retry budget is spent."""
+        if self.retry_budget.try_spend():
+            return False
+        logger.warning("Retry budget exhausted, giving up")
+        return True
 
-    @retry(
-            retry=retry_if_exception_type(TonAPIError),
-            stop=stop_after_attempt(5), 
-            wait=wait_exponential(multiplier=1, min=4, max=60)
-    )
     async def _make_request(
         self, 
         endpoint: str, 
         params: Optional[Dict] = None
     ) -> Dict[str, Any]:
-        """Make API request with error handling."""
-        async with aiohttp.ClientSession(headers=self.headers) as session:
+        """
+        Make API request with error handling.
+
+        4xx responses other than 429 fail immediately with TonClientError, 429
+        is retried after the server's Retry-After hint, and 5xx responses and
+        network errors are retried with jittered exponential backoff.
+        """
+        self.retry_budget.deposit()
+        retrying = AsyncRetrying(
+            retry=retry_if_exception(lambda e: isinstance(e, TonAPIError) and e.retryable),
+            stop=stop_after_attempt(self.max_attempts) | self._budget_exhausted,
+            wait=self._wait,
+            sleep=self._sleep,
+            reraise=True
+        )
+        return await retrying(self._request_once, endpoint, params)
+
+    async def _request_once(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Make a single API request attempt."""
+        self.circuit_breaker.before_request()
+        url = f"{self.base_url}/{endpoint}"
+        # True/False record a success/failure with the breaker, None leaves it
+        # closed but re-opens a half-open one (cancelled trials, rate limits)
+        outcome: Optional[bool] = None
+        start = time.perf_counter()
+
+        with profile_stage("network"):
             try:
-                url = f"{self.base_url}/{endpoint}"
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        raise TonAPIError(f"API request failed: {response.status}")
-                    return await response.json()
-            except Exception as e:
-                logger.error(f"API request failed: {str(e)}")
-                raise TonAPIError(str(e))
+                async with aiohttp.ClientSession(headers=self.headers, timeout=self.timeout) as session:
+                    async with session.get(url, params=params) as response:
+                        if response.status == 200:
+                            data = await response.json()
+                            outcome = True
+                            latency = time.perf_counter() - start
+                            for listener in self.latency_listeners:
+                                listener(latency)
+                            return data
+
+                        message = f"API request failed: {response.status}"
+                        if response.status == 429:
+                            error = TonRateLimitError(
+                                message,
+                                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                            )
+                        elif 400 <= response.status < 500:
+                            outcome = True
+                            error = TonClientError(message, status=response.status)
+                        else:
+                            outcome = False
+                            error = TonAPIError(message, status=response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+                outcome = False
+                error = TonAPIError(f"API request failed: {e!r}")
+            except Exception:
+                outcome = False
+                raise
+            finally:
+                if outcome is True:
+                    self.circuit_breaker.record_success()
+                elif outcome is False:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_inconclusive()
+
+        logger.error(f"{str(error)} ({url})")
+        raise error
             
     @staticmethod
     def format_address(raw_address: str) -> str:
@@ -58,11 +175,11 @@ class TonExplorer(BlockchainExplorer):
     async def get_account_transactions(
         self, 
         address: str, 
-        limit: int = 1000
+        limit: int = 1000,
+        after_lt: int = 0
     ) -> pd.DataFrame:
-        """Get account transactions."""
+        """Get account transactions with logical time greater than after_lt."""
         all_transactions = []
-        after_lt = 0
         logger.info(f"Fetching transactions for {address}")
 
         while True:
@@ -87,13 +204,101 @@ class TonExplorer(BlockchainExplorer):
                 
             await asyncio.sleep(random.uniform(0.05, 0.4))  # Rate limiting
             
-        return pd.json_normalize(all_transactions, sep='_') if all_transactions else pd.DataFrame()
+        with profile_stage("json_normalize"):
+            return pd.json_normalize(all_transactions, sep='_') if all_transactions else pd.DataFrame()
 
     async def get_transaction_info(self, tx_hash: str) -> Dict[str, Any]:
         """Get transaction details."""
         endpoint = f"blockchain/transactions/{tx_hash}"
         return await self._make_request(endpoint)
 
+    async def get_masterchain_blocks(self, seqno: int) -> List[Dict[str, Any]]:
+        """
+        Get the masterchain block with the given seqno and the shard blocks it commits.
+
+        Returns:
+            List of dicts with workchain_id, shard and seqno of each block
+        """
+        endpoint = f"blockchain/masterchain/{seqno}/blocks"
+        response = await self._make_request(endpoint)
+        return [
+            {
+                'workchain_id': block.get('workchain_id'),
+                'shard': block.get('shard'),
+                'seqno': block.get('seqno')
+            }
+            for block in response.get('blocks', [])
+        ]
+
+    async def get_block_transactions(
+        self,
+        workchain_id: int,
+        shard: str,
+        seqno: int
+    ) -> pd.DataFrame:
+        """Get all transactions of a block."""
+        endpoint = f"blockchain/blocks/({workchain_id},{shard},{seqno})/transactions"
+        response = await self._make_request(endpoint)
+        transactions = response.get('transactions', [])
+        with profile_stage("json_normalize"):
+            return pd.json_normalize(transactions, sep='_') if transactions else pd.DataFrame()
+
+    async def stream_account_transactions(
+        self,
+        accounts: List[str],
+        read_timeout: float = 60.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Subscribe to the server-sent events feed of new account transactions.
+
+        Args:
+            accounts: Addresses to subscribe to
+            read_timeout: Seconds without any data (including heartbeats) before the stream is dropped
+
+        Yields:
+            Dicts with the event type under 'event' and the decoded payload under 'data'.
+            The first one is an 'open' event, sent as soon as the subscription is live.
+        """
+        url = f"{self.base_url}/sse/accounts/transactions"
+        params = {"accounts": ",".join(accounts)}
+        headers = {**self.headers, "Accept": "text/event-stream"}
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=read_timeout)
+
+        try:
+            async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+                async with session.get(url, params=params) as response:
+                    if response.status != 200:
+                        raise TonAPIError(f"Stream request failed: {response.status}")
+                    yield {"event": "open", "data": None}
+
+                    event_type, data_lines = "message", []
+                    async for raw_line in response.content:
+                        line = raw_line.decode("utf-8").rstrip("\r\n")
+
+                        if not line:
+                            if data_lines or event_type != "message":
+                                data = "\n".join(data_lines)
+                                try:
+                                    data = json.loads(data) if data else None
+                                except json.JSONDecodeError:
+                                    pass
+                                yield {"event": event_type, "data": data}
+                            event_type, data_lines = "message", []
+                            continue
+
+                        if line.startswith(":"):
+                            continue
+
+                        field, _, value = line.partition(":")
+                        value = value[1:] if value.startswith(" ") else value
+                        if field == "event":
+                            event_type = value
+                        elif field == "data":
+                            data_lines.append(value)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Transaction stream failed: {str(e)}")
+            raise TonAPIError(str(e))
+
     def extract_transfers(self, transactions: List[Dict]) -> pd.DataFrame:
         """Extract transfers from transactions."""
         transfers = []
@@ -1,27 +1,37 @@
-from typing import List
+from typing import List, Optional
+from pathlib import Path
 import asyncio
+import threading
 import pandas as pd
 import ast
 
+from .base import BlockchainExplorer
 from .explorer import TonExplorer
+from .toncenter import ToncenterExplorer
+from .composite import CompositeExplorer
 from .exceptions import TonDataError
 from .mapping import DEFAULT_TRANSACTION_COLUMNS, DEFAULT_OUT_MSG_COLUMNS
 from ..db import get_postgres_manager
+from ..graph import CounterpartyGraph
 from ..utils import logger
+from ..utils.profiling import Profiler, profile_stage, profile_address
 
 class TransactionLoader:
     """Class for loading and storing TON transactions."""
     
     def __init__(
         self,
-        explorer: TonExplorer,
+        explorer: BlockchainExplorer,
         batch_size: int = 10,
-        batch_delay: float = 0.1
+        batch_delay: float = 0.1,
+        graph: Optional[CounterpartyGraph] = None
     ):
         self.explorer = explorer
         self.db = get_postgres_manager()
         self.batch_size = batch_size
         self.batch_delay = batch_delay
+        self.graph = graph
+        self._graph_lock = threading.Lock()
 
     def _prepare_transaction_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare transaction dataframe with selected columns."""
@@ -56,32 +66,44 @@ class TransactionLoader:
             print(f"Error preparing out messages dataframe: {e}")
             return pd.DataFrame(columns=DEFAULT_OUT_MSG_COLUMNS)
 
-    async def process_address(self, address: str) -> None:
-        """Process transactions for a single address."""
-        try:
-            # Get transactions
-            transactions_df = await self.explorer.get_account_transactions(address)
-            if transactions_df.empty:
-                logger.info(f"No transactions found for address: {address}")
-                return
-            
+    def store_transactions(self, transactions_df: pd.DataFrame) -> None:
+        """
+        Prepare transactions and their out messages and store them in the database.
+
+        Storing the same transactions again replaces the earlier rows.
+
+        Raises:
+            TonDataError: If the upload fails, in which case nothing is stored
+        """
+        with profile_stage("prepare_transactions"):
             tx_df = self._prepare_transaction_df(transactions_df)
+        with profile_stage("prepare_out_msgs"):
             out_msgs_df = self._prepare_out_msg_df(transactions_df)
 
-            # Store in database only if dataframes have data
-            if not tx_df.empty: 
-                self.db.upload_dataframe(
-                    df = tx_df,
-                    table_name = 'transactions',
-                    if_exists='append'
-                )
+        # Both tables are written in one transaction and rows of a batch that was
+        # stored before are replaced, so retrying a failed batch is safe
+        with profile_stage("upload"):
+            uploaded = self.db.replace_rows({'transactions': tx_df, 'out_msgs': out_msgs_df})
+        if not uploaded:
+            raise TonDataError(
+                f"Failed to upload {len(tx_df)} transactions and {len(out_msgs_df)} out messages"
+            )
+
+        if self.graph is not None and not out_msgs_df.empty:
+            with profile_stage("update_graph"), self._graph_lock:
+                self.graph.add_out_msgs(out_msgs_df)
+
+    async def process_address(self, address: str) -> None:
+        """Process transactions for a single address."""
+        try:
+            with profile_address(address):
+                # Get transactions
+                transactions_df = await self.explorer.get_account_transactions(address)
+                if transactions_df.empty:
+                    logger.info(f"No transactions found for address: {address}")
+                    return
                 
-            if not out_msgs_df.empty:  
-                self.db.upload_dataframe(
-                    df = out_msgs_df,
-                    table_name = 'out_msgs',
-                    if_exists='append'
-                )
+                self.store_transactions(transactions_df)
             
             logger.info(f"Processed {len(transactions_df)} transactions for {address}")
             
@@ -118,7 +140,8 @@ class TransactionLoader:
         """Process transactions for all recipients of a host address."""
         try:
             # Get host transactions
-            host_df = await self.explorer.get_account_transactions(host_address)
+            with profile_address(host_address):
+                host_df = await self.explorer.get_account_transactions(host_address)
             if host_df.empty:
                 logger.info(f"No transactions found for host address: {host_address}")
                 return
@@ -150,15 +173,50 @@ class TransactionLoader:
             raise TonDataError(f"Failed to process recipients: {str(e)}")
 
     @classmethod
-    async def main(cls, api_key: str, host_address: str) -> None:
-        """Main entry point for processing transactions."""
-        explorer = TonExplorer(api_key)
+    async def main(
+        cls,
+        api_key: str,
+        host_address: str,
+        toncenter_api_key: Optional[str] = None,
+        profiler: Optional[Profiler] = None,
+        graph_path: Optional[str] = None
+    ) -> None:
+        """
+        Main entry point for processing transactions.
+
+        If graph_path is given, the counterparty graph saved there is loaded (or
+        built from the database if there is none yet), updated with the stored
+        batches and saved back at the end.
+        """
+        explorer: BlockchainExplorer = TonExplorer(api_key)
+        if toncenter_api_key:
+            explorer = CompositeExplorer([explorer, ToncenterExplorer(toncenter_api_key)])
         loader = cls(explorer)
         
         try:
+            if graph_path:
+                loader.graph = loader._open_graph(graph_path)
+            if profiler is not None:
+                if profiler.trace_memory:
+                    # Memory peaks are only recorded for stages that don't overlap
+                    logger.info("Tracing memory, processing one address at a time")
+                    loader.batch_size = 1
+                profiler.start()
             await loader.process_recipient_transactions(host_address)
             logger.info("Transaction processing completed successfully")
         except Exception as e:
             logger.error(f"Transaction processing failed: {str(e)}")
         finally:
-            loader.db.close()
\ No newline at end of file
+            if profiler is not None:
+                profiler.stop()
+                print(profiler.report())
+            if loader.graph is not None:
+                loader.graph.save(graph_path)
+            loader.db.close()
+
+    def _open_graph(self, path: str) -> CounterpartyGraph:
+        """Load the counterparty graph saved at path, or build it from the stored out messages."""
+        if (Path(path) / 'indptr.npy').exists():
+            return CounterpartyGraph.load(path)
+        logger.info(f"No counterparty graph at {path}, building it from the database")
+        return CounterpartyGraph.from_edges(self.db.get_counterparty_edges())
\ No newline at end of file
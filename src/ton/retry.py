@@ -0,0 +1,138 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from .exceptions import TonCircuitOpenError
+from ..utils.logging import logger
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of regular requests.
+
+    Every request deposits `ratio` tokens and every retry spends one, so under
+    a sustained outage retries add at most `ratio` extra load on top of the
+    regular traffic. The bucket starts full to allow retries right away.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 20.0):
+        """
+        Args:
+            ratio: Tokens deposited per request
+            max_tokens: Bucket capacity
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        """Record a request."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take a token for a retry, returning False when the budget is exhausted."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker shared by all requests to one API.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests
+    fail immediately for `reset_timeout` seconds. Then a single trial request is
+    let through: success closes the circuit, failure opens it again. A trial
+    without a conclusive outcome (cancelled, rate limited) re-opens the circuit,
+    and a trial that reports nothing within `reset_timeout` is replaced by a new one.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            name: Name used in logs and errors, usually the API base url
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_started_at = 0.0
+
+    def before_request(self) -> None:
+        """Raise TonCircuitOpenError if requests should not be sent."""
+        if self.state == self.CLOSED:
+            return
+
+        now = time.monotonic()
+        trial_due = (
+            self.state == self.OPEN and now - self.opened_at >= self.reset_timeout
+        ) or (
+            self.state == self.HALF_OPEN and now - self.trial_started_at >= self.reset_timeout
+        )
+        if trial_due:
+            logger.info(f"Circuit for {self.name} half-open, sending trial request")
+            self.state = self.HALF_OPEN
+            self.trial_started_at = now
+            return
+
+        raise TonCircuitOpenError(f"Circuit for {self.name} is open")
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_inconclusive(self) -> None:
+        """Record a request that neither proves nor disproves the API is healthy."""
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_retry_budget: Optional[RetryBudget] = None
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_retry_budget() -> RetryBudget:
+    """Get the retry budget shared by all explorers in the process."""
+    global _retry_budget
+
+    if _retry_budget is None:
+        _retry_budget = RetryBudget()
+    return _retry_budget
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get the circuit breaker shared by all explorers talking to the same API."""
+    if name not in _circuit_breakers:
+        _circuit_breakers[name] = CircuitBreaker(name)
+    return _circuit_breakers[name]
@@ -0,0 +1,49 @@
+import asyncio
+import sys
+from typing import Optional
+from argparse import ArgumentParser
+
+from src.ton import TonExplorer, TransactionLoader
+from src.ton.block_loader import BlockRangeLoader
+from src.utils import settings, logger
+
+async def run_block_loader(
+    start_seqno: Optional[int] = None,
+    end_seqno: Optional[int] = None,
+    concurrency: int = 8
+) -> None:
+    """
+    Load all transactions of a masterchain seqno range.
+    
+    Args:
+        start_seqno: First masterchain seqno. If None, uses command line arguments.
+        end_seqno: Masterchain seqno after the last one to load.
+        concurrency: Number of block ranges processed at the same time.
+    """
+    parser = ArgumentParser(description="Load all transactions of a masterchain seqno range.")
+    parser.add_argument("start_seqno", type=int, nargs="?", help="First masterchain seqno")
+    parser.add_argument("end_seqno", type=int, nargs="?", help="Masterchain seqno after the last one to load")
+    parser.add_argument("--concurrency", type=int, default=concurrency, help="Block ranges processed at the same time")
+    args = parser.parse_args()
+
+    if start_seqno is None or end_seqno is None:
+        if args.start_seqno is None or args.end_seqno is None:
+            logger.error("Please provide start and end masterchain seqno as arguments")
+            sys.exit(1)
+        start_seqno, end_seqno = args.start_seqno, args.end_seqno
+        concurrency = args.concurrency
+
+    loader = TransactionLoader(TonExplorer(settings.TON_API_KEY))
+    block_loader = BlockRangeLoader(loader, concurrency=concurrency)
+
+    try:
+        logger.info(f"Starting block processing for seqno {start_seqno}-{end_seqno}")
+        await block_loader.process_blocks(start_seqno, end_seqno)
+    except Exception as e:
+        logger.error(f"Failed to process blocks: {str(e)}")
+        sys.exit(1)
+    finally:
+        loader.db.close()
+
+if __name__ == "__main__":
+    asyncio.run(run_block_loader())
@@ -5,18 +5,37 @@ from argparse import ArgumentParser
 
 from src.ton import TransactionLoader
 from src.utils import settings, logger
+from src.utils.profiling import Profiler
 
-async def run_loader(host_address: Optional[str] = None) -> None:
+async def run_loader(
+    host_address: Optional[str] = None,
+    profiler: Optional[Profiler] = None,
+    graph_path: Optional[str] = None
+) -> None:
     """
     Run transaction loader for a given host address.
     
     Args:
         host_address: TON wallet address to process. If None, uses command line argument.
+        profiler: Profiler recording per-stage timings. If None, uses command line flags.
+        graph_path: Directory of the counterparty graph to update. If None, uses command line flag.
     """
     parser = ArgumentParser(description="Run transaction loader for a given host address.")
     parser.add_argument("host_address", type=str, nargs="?", help="TON wallet address to process")
+    parser.add_argument("--profile", action="store_true", help="Record and report per-stage timings")
+    parser.add_argument("--profile-memory", action="store_true", help="Also record tracemalloc peaks per stage, processing one address at a time")
+    parser.add_argument("--profile-output", type=str, help="Write cProfile stats to this file")
+    parser.add_argument("--graph", type=str, help="Load, update and save the counterparty graph in this directory")
     args = parser.parse_args()
 
+    if profiler is None and (args.profile or args.profile_memory or args.profile_output):
+        profiler = Profiler(
+            trace_memory=args.profile_memory,
+            cprofile_path=args.profile_output
+        )
+
+    graph_path = graph_path or args.graph
+
     if not host_address:
         if not args.host_address:
             logger.error("Please provide a host address as argument")
@@ -28,7 +47,10 @@ async def run_loader(host_address: Optional[str] = None) -> None:
         logger.info(f"Using API key: {settings.TON_API_KEY}")
         await TransactionLoader.main(
             api_key=settings.TON_API_KEY,
-            host_address=host_address
+            host_address=host_address,
+            toncenter_api_key=settings.TONCENTER_API_KEY,
+            profiler=profiler,
+            graph_path=graph_path
         )
     except Exception as e:
         logger.error(f"Failed to process transactions: {str(e)}")
@@ -0,0 +1,41 @@
+import asyncio
+import sys
+from typing import List, Optional
+from argparse import ArgumentParser
+
+from src.ton import TonExplorer, TransactionLoader
+from src.ton.streamer import TransactionStreamer
+from src.utils import settings, logger
+
+async def run_streamer(addresses: Optional[List[str]] = None) -> None:
+    """
+    Follow new transactions of the given addresses and store them as they happen.
+    
+    Args:
+        addresses: TON addresses to follow. If None, uses command line arguments.
+    """
+    parser = ArgumentParser(description="Stream new transactions for the given addresses.")
+    parser.add_argument("addresses", type=str, nargs="*", help="TON addresses to follow")
+    args = parser.parse_args()
+
+    if not addresses:
+        if not args.addresses:
+            logger.error("Please provide at least one address as argument")
+            sys.exit(1)
+        addresses = args.addresses
+
+    explorer = TonExplorer(settings.TON_API_KEY)
+    loader = TransactionLoader(explorer)
+    streamer = TransactionStreamer(explorer, loader, addresses)
+
+    try:
+        logger.info(f"Starting transaction stream for {len(addresses)} addresses")
+        await streamer.run()
+    except Exception as e:
+        logger.error(f"Transaction streaming failed: {str(e)}")
+        sys.exit(1)
+    finally:
+        loader.db.close()
+
+if __name__ == "__main__":
+    asyncio.run(run_streamer())
@@ -0,0 +1,253 @@
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Dict, Any, List, Optional
+import pandas as pd
+from pytoniq_core import Address
+
+from .explorer import TonExplorer
+from .loader import TransactionLoader
+from .exceptions import TonAPIError, TonDataError
+from ..utils.logging import logger
+
+_STREAM_CLOSED = object()
+
+class TransactionStreamer:
+    """
+    Keep a set of accounts current by following the tonapi transaction stream.
+
+    New transactions announced by the stream are fetched one by one and stored
+    through TransactionLoader in small micro-batches. After every (re)connect the
+    gap since the last stored logical time of each account is backfilled. The
+    backfill starts only once the subscription is live, and stream events
+    received meanwhile are queued and deduplicated by lt, so transactions that
+    happen around a reconnect are not missed.
+    """
+
+    def __init__(
+        self,
+        explorer: TonExplorer,
+        loader: TransactionLoader,
+        accounts: List[str],
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+        read_timeout: float = 60.0
+    ):
+        """
+        Args:
+            explorer: Explorer providing the transaction stream
+            loader: Loader used to prepare and store transactions
+            accounts: Addresses to follow
+            batch_size: Number of buffered transactions that triggers a flush
+            flush_interval: Maximum age in seconds of buffered transactions
+            reconnect_delay: Initial delay before reconnecting after a stream failure
+            max_reconnect_delay: Upper bound for the exponential reconnect delay
+            read_timeout: Seconds without any stream data before reconnecting
+        """
+        self.explorer = explorer
+        self.loader = loader
+        self.accounts = [self._raw_address(addr) for addr in accounts]
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.read_timeout = read_timeout
+
+        # Last lt stored in the database per account, advanced only after a successful store
+        self.last_lts: Dict[str, int] = {}
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_lts: Dict[str, int] = {}
+        self._buffer_started = 0.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._subscribed = False
+        self._stopped = False
+
+    @staticmethod
+    def _raw_address(address: str) -> str:
+        """Convert an address to the raw form used by the stream and the database."""
+        return Address(address).to_str(is_user_friendly=False).lower()
+
+    def stop(self) -> None:
+        """Stop the streamer after the current event."""
+        self._stopped = True
+        if self._queue is not None:
+            self._queue.put_nowait(_STREAM_CLOSED)
+
+    def _known_lt(self, account: str) -> Optional[int]:
+        """Highest lt of an account that is stored or buffered."""
+        lts = [lts[account] for lts in (self.last_lts, self._buffer_lts) if account in lts]
+        return max(lts) if lts else None
+
+    def _flush_due(self) -> bool:
+        if not self._buffer:
+            return False
+        return (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._buffer_started >= self.flush_interval
+        )
+
+    def _flush_timeout(self) -> Optional[float]:
+        """Seconds until the buffer is due for a flush, None if it is empty."""
+        if not self._buffer:
+            return None
+        return max(0.0, self._buffer_started + self.flush_interval - time.monotonic())
+
+    async def flush(self) -> None:
+        """
+        Store buffered transactions.
+
+        Raises:
+            TonDataError: If storing fails; the buffer is dropped without advancing
+                last_lts, so the next backfill fetches the transactions again
+        """
+        if not self._buffer:
+            return
+
+        buffer, buffer_lts = self._buffer, self._buffer_lts
+        self._buffer, self._buffer_lts = [], {}
+
+        transactions_df = pd.json_normalize(buffer, sep='_')
+        await asyncio.to_thread(self.loader.store_transactions, transactions_df)
+        for account, lt in buffer_lts.items():
+            self.last_lts[account] = max(self.last_lts.get(account, 0), lt)
+        logger.info(f"Stored {len(buffer)} streamed transactions")
+
+    def _buffer_transaction(self, account: str, transaction: Dict[str, Any]) -> None:
+        if not self._buffer:
+            self._buffer_started = time.monotonic()
+        self._buffer.append(transaction)
+        lt = int(transaction.get('lt', 0))
+        self._buffer_lts[account] = max(self._buffer_lts.get(account, 0), lt)
+
+    async def _init_missing_lts(self) -> None:
+        """Start accounts without stored transactions from their current last lt."""
+        for account in self.accounts:
+            if account in self.last_lts:
+                continue
+            try:
+                info = await self.explorer.get_account_info(account)
+            except TonAPIError as e:
+                logger.warning(f"Could not get last lt for {account}: {str(e)}")
+                continue
+            if last_lt := info.get('last_transaction_lt'):
+                self.last_lts[account] = int(last_lt)
+
+    async def backfill(self) -> None:
+        """Fetch and store transactions newer than the last stored lt of each account."""
+        await self.flush()
+
+        for account in self.accounts:
+            after_lt = self.last_lts.get(account)
+            if after_lt is None:
+                continue
+
+            transactions_df = await self.explorer.get_account_transactions(account, after_lt=after_lt)
+            if transactions_df.empty:
+                continue
+
+            await asyncio.to_thread(self.loader.store_transactions, transactions_df)
+            self.last_lts[account] = max(after_lt, int(transactions_df['lt'].max()))
+            logger.info(f"Backfilled {len(transactions_df)} transactions for {account}")
+
+    async def _handle_event(self, event: Dict[str, Any]) -> None:
+        if event.get('event') != 'message' or not isinstance(event.get('data'), dict):
+            return
+
+        data = event['data']
+        account = (data.get('account_id') or '').lower()
+        tx_hash = data.get('tx_hash')
+        lt = int(data.get('lt', 0))
+
+        if not tx_hash:
+            return
+        known_lt = self._known_lt(account)
+        if known_lt is not None and lt <= known_lt:
+            return
+
+        transaction = await self.explorer.get_transaction_info(tx_hash)
+        self._buffer_transaction(account, transaction)
+
+    async def _read_stream(self, queue: asyncio.Queue) -> None:
+        """Forward stream events to the queue, ending with the closing marker or an error."""
+        stream = self.explorer.stream_account_transactions(
+            self.accounts, read_timeout=self.read_timeout
+        )
+        try:
+            async with aclosing(stream):
+                async for event in stream:
+                    queue.put_nowait(event)
+            queue.put_nowait(_STREAM_CLOSED)
+        except Exception as e:
+            queue.put_nowait(e)
+
+    async def _next_event(self, queue: asyncio.Queue) -> Optional[Dict[str, Any]]:
+        """
+        Next stream event, or None when a flush is due before one arrives.
+
+        Raises:
+            TonAPIError: If the stream failed
+        """
+        try:
+            item = await asyncio.wait_for(queue.get(), self._flush_timeout())
+        except asyncio.TimeoutError:
+            return None
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def _run_session(self) -> None:
+        """Subscribe, backfill the gap and process events until the stream ends."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queue = queue
+        reader = asyncio.create_task(self._read_stream(queue))
+
+        try:
+            logger.info(f"Subscribing to transactions of {len(self.accounts)} accounts")
+            # Events arriving while waiting for the subscription and during the
+            # backfill stay queued and are deduplicated by lt afterwards
+            event = await self._next_event(queue)
+            if event is _STREAM_CLOSED:
+                return
+            self._subscribed = True
+            await self.backfill()
+
+            while not self._stopped:
+                event = await self._next_event(queue)
+                if event is _STREAM_CLOSED:
+                    if not self._stopped:
+                        logger.warning("Transaction stream closed by server")
+                    return
+                if event is not None:
+                    await self._handle_event(event)
+                if self._flush_due():
+                    await self.flush()
+        finally:
+            self._queue = None
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+    async def run(self) -> None:
+        """Follow the stream until stop() is called."""
+        self.last_lts.update(self.loader.db.get_last_lts(self.accounts))
+        await self._init_missing_lts()
+        delay = self.reconnect_delay
+
+        while not self._stopped:
+            self._subscribed = False
+            try:
+                await self._run_session()
+            except (TonAPIError, TonDataError) as e:
+                logger.error(f"Transaction stream interrupted: {str(e)}")
+
+            try:
+                await self.flush()
+            except TonDataError as e:
+                logger.error(f"Failed to store streamed transactions: {str(e)}")
+
+            if not self._stopped:
+                if self._subscribed:
+                    delay = self.reconnect_delay
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
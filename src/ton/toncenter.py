@@ -0,0 +1,210 @@
+import asyncio
+import base64
+import binascii
+import random
+import pandas as pd
+from typing import Dict, Any, List, Optional
+
+from .explorer import TonExplorer
+from .exceptions import TonClientError
+from ..utils.logging import logger
+from ..utils.profiling import profile_stage
+
+class ToncenterExplorer(TonExplorer):
+    """
+    Explorer for toncenter-style indexer APIs (v3).
+
+    Responses are normalized to the tonapi.io shape, so the resulting
+    DataFrames have the same columns as the ones returned by TonExplorer.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://toncenter.com/api/v3",
+        **kwargs
+    ):
+        """
+        Args:
+            api_key: API key
+            base_url: API base url
+            kwargs: Request timeout and retry options, see TonExplorer
+        """
+        super().__init__(api_key, base_url=base_url, **kwargs)
+        self.headers = {
+            "Accept": "application/json",
+            "X-API-Key": api_key,
+            "Content-Type": "application/json"
+        }
+
+    @staticmethod
+    def _normalize_hash(value: Optional[str]) -> Optional[str]:
+        """Convert base64 hashes returned by the indexer to tonapi's hex form."""
+        if not value:
+            return value
+        try:
+            decoded = base64.b64decode(value, altchars=b'-_', validate=True)
+        except (binascii.Error, ValueError):
+            return value.lower()
+        return decoded.hex() if len(decoded) == 32 else value.lower()
+
+    @staticmethod
+    def _normalize_address(value: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Wrap a raw address the way tonapi does."""
+        if not value:
+            return None
+        return {"address": value.lower()}
+
+    def _normalize_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an indexer message to tonapi's message layout."""
+        source = msg.get('source')
+        destination = msg.get('destination')
+        content = msg.get('message_content') or {}
+        decoded = content.get('decoded') or {}
+
+        if not source:
+            msg_type = 'ext_in_msg'
+        elif not destination:
+            msg_type = 'ext_out_msg'  # e.g. event logs emitted by contracts
+        else:
+            msg_type = 'int_msg'
+
+        normalized = {
+            'hash': self._normalize_hash(msg.get('hash')),
+            'msg_type': msg_type,
+            'created_lt': int(msg['created_lt']) if msg.get('created_lt') else None,
+            'value': int(msg.get('value') or 0),
+            'fwd_fee': int(msg.get('fwd_fee') or 0),
+            'ihr_fee': int(msg.get('ihr_fee') or 0),
+            'bounce': msg.get('bounce'),
+            'source': self._normalize_address(source),
+            'destination': self._normalize_address(destination),
+            'op_code': msg.get('opcode'),
+        }
+        if decoded.get('type') == 'text_comment':
+            normalized['decoded_op_name'] = 'text_comment'
+            normalized['decoded_body'] = {'text': decoded.get('comment')}
+        return normalized
+
+    def _normalize_transaction(self, tx: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an indexer transaction to tonapi's transaction layout."""
+        description = tx.get('description') or {}
+        compute = description.get('compute_ph') or {}
+        state_after = tx.get('account_state_after') or {}
+        tx_type = description.get('type', '')
+
+        normalized = {
+            'hash': self._normalize_hash(tx.get('hash')),
+            'lt': int(tx.get('lt', 0)),
+            'account': self._normalize_address(tx.get('account')),
+            'success': not description.get('aborted', False) and compute.get('success', True),
+            'utime': tx.get('now'),
+            'orig_status': tx.get('orig_status'),
+            'end_status': tx.get('end_status'),
+            'total_fees': int(tx.get('total_fees') or 0),
+            'end_balance': int(state_after.get('balance') or 0),
+            'transaction_type': f"Trans{tx_type[:1].upper()}{tx_type[1:]}" if tx_type else None,
+            'out_msgs': [self._normalize_message(msg) for msg in tx.get('out_msgs') or []],
+        }
+        if in_msg := tx.get('in_msg'):
+            normalized['in_msg'] = self._normalize_message(in_msg)
+        return normalized
+
+    async def get_account_info(self, address: str) -> Dict[str, Any]:
+        """Get account information."""
+        return await self._make_request("account", {"address": address})
+
+    async def get_account_transactions(
+        self,
+        address: str,
+        limit: int = 1000,
+        after_lt: int = 0
+    ) -> pd.DataFrame:
+        """Get account transactions with logical time greater than after_lt."""
+        all_transactions = []
+        start_lt = after_lt + 1 if after_lt else 0
+        logger.info(f"Fetching transactions for {address} from {self.base_url}")
+
+        while True:
+            params = {
+                "account": address,
+                "limit": limit,
+                "start_lt": start_lt,
+                "sort": "asc"
+            }
+
+            response = await self._make_request("transactions", params)
+
+            transactions = response.get('transactions', [])
+            if not transactions:
+                break
+
+            all_transactions.extend(self._normalize_transaction(tx) for tx in transactions)
+            start_lt = all_transactions[-1]['lt'] + 1
+
+            if len(transactions) < limit:
+                break
+
+            await asyncio.sleep(random.uniform(0.05, 0.4))  # Rate limiting
+
+        with profile_stage("json_normalize"):
+            return pd.json_normalize(all_transactions, sep='_') if all_transactions else pd.DataFrame()
+
+    async def get_transaction_info(self, tx_hash: str) -> Dict[str, Any]:
+        """Get transaction details."""
+        response = await self._make_request("transactions", {"hash": tx_hash, "limit": 1})
+        transactions = response.get('transactions', [])
+        if not transactions:
+            raise TonClientError(f"Transaction not found: {tx_hash}", status=404)
+        return self._normalize_transaction(transactions[0])
+
+
+    async def get_masterchain_blocks(self, seqno: int) -> List[Dict[str, Any]]:
+        """
+        Get the masterchain block with the given seqno and the shard blocks it commits.
+
+        Returns:
+            List of dicts with workchain_id, shard and seqno of each block
+        """
+        response = await self._make_request("blocks", {"mc_seqno": seqno, "limit": 256})
+        return [
+            {
+                'workchain_id': block.get('workchain'),
+                'shard': block.get('shard'),
+                'seqno': block.get('seqno')
+            }
+            for block in response.get('blocks', [])
+        ]
+
+    async def get_block_transactions(
+        self,
+        workchain_id: int,
+        shard: str,
+        seqno: int,
+        limit: int = 1000
+    ) -> pd.DataFrame:
+        """Get all transactions of a block."""
+        all_transactions = []
+        offset = 0
+
+        while True:
+            params = {
+                "workchain": workchain_id,
+                "shard": shard,
+                "seqno": seqno,
+                "limit": limit,
+                "offset": offset,
+                "sort": "asc"
+            }
+
+            response = await self._make_request("transactions", params)
+
+            transactions = response.get('transactions', [])
+            all_transactions.extend(self._normalize_transaction(tx) for tx in transactions)
+            offset += len(transactions)
+
+            if len(transactions) < limit:
+                break
+
+        with profile_stage("json_normalize"):
+            return pd.json_normalize(all_transactions, sep='_') if all_transactions else pd.DataFrame()
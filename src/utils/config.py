@@ -1,9 +1,11 @@
 # src/utils/config.py
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     TON_API_KEY: str
+    TONCENTER_API_KEY: Optional[str] = None
     DB_USER: str = 'ton_user'
     DB_PASSWORD: str = 'ton_password'
     DB_HOST: str = 'localhost'
@@ -0,0 +1,202 @@
+import cProfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .logging import logger
+
+_current_profiler: ContextVar[Optional["Profiler"]] = ContextVar("current_profiler", default=None)
+_current_address: ContextVar[Optional[str]] = ContextVar("current_address", default=None)
+
+@dataclass
+class StageStats:
+    """Accumulated measurements of one stage for one address."""
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    # None until a run of the stage without overlapping stages is measured
+    peak_memory: Optional[int] = None
+
+@dataclass(eq=False)
+class _OpenStage:
+    """Stage being measured, marked when another stage runs at the same time."""
+    overlapped: bool
+
+
+class Profiler:
+    """
+    Per-stage profiler for the loader pipeline.
+
+    While active, every profile_stage() block records wall time and process CPU
+    time under the stage name and the address set by profile_address(). Optionally
+    tracemalloc peak allocations are recorded per stage and the whole run is
+    captured with cProfile.
+
+    CPU time is process-wide, so when several addresses are processed
+    concurrently it also includes work done by other tasks in the meantime and
+    should be read as approximate. The tracemalloc peak is a single global
+    counter that every stage resets, so memory peaks are only recorded for
+    stages that did not overlap with another stage; the others are counted in
+    overlapped_stages. Process addresses one at a time for complete memory data.
+    """
+
+    def __init__(
+        self,
+        trace_memory: bool = False,
+        cprofile_path: Optional[Union[str, Path]] = None
+    ):
+        """
+        Args:
+            trace_memory: Record tracemalloc peak allocations per stage
+            cprofile_path: Path to write cProfile stats to, e.g. for snakeviz or flameprof
+        """
+        self.trace_memory = trace_memory
+        self.cprofile_path = Path(cprofile_path) if cprofile_path else None
+        self.stats: Dict[Tuple[str, str], StageStats] = {}
+        self.overlapped_stages = 0
+        self._open_stages: List[_OpenStage] = []
+        self._lock = threading.Lock()
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._token = None
+
+    def start(self) -> None:
+        """Activate the profiler for the current context."""
+        self._token = _current_profiler.set(self)
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self) -> None:
+        """Deactivate the profiler and write cProfile stats if requested."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self.cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cprofile.dump_stats(self.cprofile_path)
+            logger.info(f"cProfile stats written to {self.cprofile_path}")
+            self._cprofile = None
+        if self.trace_memory:
+            tracemalloc.stop()
+            if self.overlapped_stages:
+                logger.warning(
+                    f"Memory peaks of {self.overlapped_stages} stages were not recorded because "
+                    f"they overlapped with other stages; process addresses one at a time to get them"
+                )
+        if self._token is not None:
+            _current_profiler.reset(self._token)
+            self._token = None
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure a block of code as the given stage."""
+        if self.trace_memory:
+            with self._lock:
+                # Resetting the peak would wipe the one of any stage still open,
+                # so overlapping stages are all excluded from memory peaks
+                stage = _OpenStage(overlapped=bool(self._open_stages))
+                for other in self._open_stages:
+                    other.overlapped = True
+                self._open_stages.append(stage)
+                memory_start = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        try:
+            yield
+        finally:
+            stats = self.stats.setdefault((name, _current_address.get() or '-'), StageStats())
+            stats.calls += 1
+            stats.wall_time += time.perf_counter() - wall_start
+            stats.cpu_time += time.process_time() - cpu_start
+            if self.trace_memory:
+                with self._lock:
+                    self._open_stages.remove(stage)
+                    if stage.overlapped:
+                        self.overlapped_stages += 1
+                    else:
+                        peak = tracemalloc.get_traced_memory()[1] - memory_start
+                        stats.peak_memory = max(stats.peak_memory or 0, peak)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Recorded measurements, one row per stage and address."""
+        return pd.DataFrame(
+            [
+                {
+                    'stage': stage,
+                    'address': address,
+                    'calls': stats.calls,
+                    'wall_time': stats.wall_time,
+                    'cpu_time': stats.cpu_time,
+                    'peak_memory_mb': (
+                        stats.peak_memory / 2**20 if stats.peak_memory is not None else None
+                    )
+                }
+                for (stage, address), stats in self.stats.items()
+            ],
+            columns=['stage', 'address', 'calls', 'wall_time', 'cpu_time', 'peak_memory_mb']
+        )
+
+    def report(self, top_n: int = 10) -> str:
+        """Ranked report of the slowest stages and addresses."""
+        df = self.to_dataframe()
+        if df.empty:
+            return "No profiling data recorded"
+
+        stages = df.groupby('stage').agg(
+            calls=('calls', 'sum'),
+            wall_time=('wall_time', 'sum'),
+            cpu_time=('cpu_time', 'sum'),
+            peak_memory_mb=('peak_memory_mb', 'max')
+        ).sort_values('wall_time', ascending=False)
+
+        addresses = df.pivot_table(
+            index='address', columns='stage', values='wall_time', aggfunc='sum', fill_value=0.0
+        )
+        addresses.insert(0, 'total', addresses.sum(axis=1))
+        addresses = addresses.sort_values('total', ascending=False).head(top_n)
+
+        if not self.trace_memory:
+            stages = stages.drop(columns='peak_memory_mb')
+
+        return (
+            "Stages by wall time (seconds):\n"
+            f"{stages.to_string(float_format='{:.3f}'.format)}\n\n"
+            f"Slowest {len(addresses)} addresses by wall time (seconds):\n"
+            f"{addresses.to_string(float_format='{:.3f}'.format)}"
+        )
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    """Measure a block of code as a stage of the active profiler, if any."""
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+@contextmanager
+def profile_address(address: str) -> Iterator[None]:
+    """Attribute stages measured inside the block to an address."""
+    token = _current_address.set(address)
+    try:
+        yield
+    finally:
+        _current_address.reset(token)
@@ -0,0 +1,87 @@
+import os
+
+os.environ.setdefault("TON_API_KEY", "test")
+
+import pandas as pd
+import pytest
+from aiohttp import web
+
+from src.ton import TonExplorer, TransactionLoader
+from src.ton.retry import CircuitBreaker, RetryBudget
+
+class FakeDB:
+    """In-memory replacement for PostgresManager."""
+
+    def __init__(self, fail_tables=()):
+        self.fail_tables = set(fail_tables)
+        self.tables = {}
+        self.uploads = []
+        self.failed_uploads = 0
+        self.checkpoints = {}
+        self.last_lts = {}
+
+    def replace_rows(self, frames, key='hash', chunk_size=5000):
+        # Tables are written one after another into a copy that is only kept
+        # if all of them succeed, like the database transaction
+        staged = dict(self.tables)
+        uploads = []
+        for table_name, df in frames.items():
+            if df.empty:
+                continue
+            if table_name in self.fail_tables:
+                self.failed_uploads += 1
+                return False
+            existing = staged.get(table_name, pd.DataFrame(columns=df.columns))
+            kept = existing[~existing[key].isin(df[key].dropna())]
+            staged[table_name] = pd.concat([kept, df], ignore_index=True)
+            uploads.append((table_name, df.copy()))
+        self.tables = staged
+        self.uploads.extend(uploads)
+        return True
+
+    def uploaded(self, table_name):
+        return [df for name, df in self.uploads if name == table_name]
+
+    def rows(self, table_name):
+        return self.tables.get(table_name, pd.DataFrame())
+
+    def get_last_lts(self, addresses):
+        return {a: lt for a, lt in self.last_lts.items() if a in addresses}
+
+    def get_block_checkpoint(self, range_start, range_end):
+        return self.checkpoints.get((range_start, range_end))
+
+    def save_block_checkpoint(self, range_start, range_end, last_seqno):
+        self.checkpoints[(range_start, range_end)] = last_seqno
+        return True
+
+def make_explorer(base_url: str, explorer_cls=TonExplorer, **kwargs):
+    """Explorer with its own breaker and budget and short backoff, unless given."""
+    kwargs.setdefault("backoff_max", 0.01)
+    kwargs.setdefault("circuit_breaker", CircuitBreaker(base_url))
+    kwargs.setdefault("retry_budget", RetryBudget())
+    return explorer_cls("key", base_url=base_url, **kwargs)
+
+def make_loader(base_url: str, db: FakeDB) -> TransactionLoader:
+    loader = TransactionLoader(make_explorer(base_url))
+    loader.db = db
+    return loader
+
+@pytest.fixture
+async def stub_server():
+    """Start local aiohttp stub servers and return their base urls."""
+    runners = []
+
+    async def start(app: web.Application) -> str:
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    yield start
+
+    for runner in runners:
+        await runner.cleanup()
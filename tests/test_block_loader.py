@@ -0,0 +1,74 @@
+import pytest
+from aiohttp import web
+
+from src.ton import BlockRangeLoader, TonDataError
+from .conftest import FakeDB, make_loader
+
+@pytest.fixture
+async def block_api(stub_server):
+    async def blocks(request):
+        seqno = int(request.match_info['seqno'])
+        return web.json_response({"blocks": [
+            {"workchain_id": -1, "shard": "8000000000000000", "seqno": seqno},
+            {"workchain_id": 0, "shard": "8000000000000000", "seqno": seqno * 10},
+        ]})
+
+    async def transactions(request):
+        block_id = request.match_info['block_id']
+        return web.json_response({"transactions": [{
+            "hash": block_id,
+            "lt": 1,
+            "account": {"address": "0:aa"},
+            "out_msgs": [{"hash": f"m{block_id}", "value": 1, "destination": {"address": "0:bb"}}]
+        }]})
+
+    app = web.Application()
+    app.router.add_get("/blockchain/masterchain/{seqno}/blocks", blocks)
+    app.router.add_get("/blockchain/blocks/{block_id}/transactions", transactions)
+    return await stub_server(app)
+
+async def test_ranges_resume_from_checkpoint(block_api):
+    db = FakeDB()
+    db.checkpoints[(10, 12)] = 10
+    block_loader = BlockRangeLoader(make_loader(block_api, db), range_size=2)
+
+    await block_loader.process_blocks(10, 15)
+
+    assert db.checkpoints == {(10, 12): 11, (12, 14): 13, (14, 15): 14}
+    # Blocks 11..14, each with a masterchain and a shard block
+    assert [len(df) for df in db.uploaded('transactions')] == [2, 2, 2, 2]
+
+async def test_failed_upload_does_not_advance_checkpoint(block_api):
+    db = FakeDB(fail_tables={'out_msgs'})
+    block_loader = BlockRangeLoader(make_loader(block_api, db), range_size=5)
+
+    with pytest.raises(TonDataError):
+        await block_loader.process_blocks(0, 5)
+
+    assert (0, 5) not in db.checkpoints
+
+async def test_rerun_after_failed_out_msgs_stores_transactions_once(block_api):
+    # Transactions are written before out_msgs fails, then the range is retried
+    db = FakeDB(fail_tables={'out_msgs'})
+    block_loader = BlockRangeLoader(make_loader(block_api, db), range_size=5)
+
+    with pytest.raises(TonDataError):
+        await block_loader.process_blocks(0, 5)
+    db.fail_tables.clear()
+    await block_loader.process_blocks(0, 5)
+
+    assert db.checkpoints == {(0, 5): 4}
+    assert db.rows('transactions')['hash'].is_unique
+    assert len(db.rows('transactions')) == 10
+    assert len(db.rows('out_msgs')) == 10
+
+async def test_reprocessing_a_range_replaces_rows(block_api):
+    db = FakeDB()
+    block_loader = BlockRangeLoader(make_loader(block_api, db), range_size=5)
+
+    await block_loader.process_blocks(0, 5)
+    db.checkpoints.clear()
+    await block_loader.process_blocks(0, 5)
+
+    assert len(db.rows('transactions')) == 10
+    assert len(db.rows('out_msgs')) == 10
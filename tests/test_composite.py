@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from src.ton import CompositeExplorer, TonAPIError, TonClientError, ToncenterExplorer
+from .conftest import make_explorer
+
+def transaction(tx_hash: str, lt: int = 1) -> dict:
+    return {"hash": tx_hash, "lt": lt, "account": {"address": "0:aa"}, "out_msgs": []}
+
+def provider_app(delay: float = 0.0, status: int = 200, pages: int = 1) -> web.Application:
+    """Stub tonapi provider answering after a delay, with a fixed status."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request.path)
+        await asyncio.sleep(delay)
+        if status != 200:
+            return web.json_response({}, status=status)
+        if "/accounts/" in request.path:
+            after_lt = int(request.query["after_lt"])
+            limit = int(request.query["limit"])
+            lts = range(after_lt + 1, min(after_lt + 1 + limit, pages * limit + 1))
+            return web.json_response({"transactions": [transaction(f"h{lt}", lt) for lt in lts]})
+        return web.json_response(transaction(request.match_info["hash"]))
+
+    app = web.Application()
+    app.router.add_get("/blockchain/transactions/{hash}", handler)
+    app.router.add_get("/blockchain/accounts/{address}/transactions", handler)
+    app["calls"] = calls
+    return app
+
+async def make_composite(stub_server, *apps, **kwargs):
+    providers = [make_explorer(await stub_server(app), max_attempts=1) for app in apps]
+    return CompositeExplorer(providers, **kwargs), providers
+
+async def test_fails_over_to_next_provider(stub_server):
+    failing, healthy = provider_app(status=500), provider_app()
+    composite, _ = await make_composite(stub_server, failing, healthy)
+
+    assert (await composite.get_transaction_info("abc"))["hash"] == "abc"
+    assert len(failing["calls"]) == 1
+    assert len(healthy["calls"]) == 1
+
+async def test_raises_when_all_providers_fail(stub_server):
+    composite, _ = await make_composite(stub_server, provider_app(status=500), provider_app(status=502))
+
+    with pytest.raises(TonAPIError, match="All providers failed"):
+        await composite.get_transaction_info("abc")
+
+async def test_hedges_slow_single_request(stub_server):
+    slow, fast = provider_app(delay=1.0), provider_app()
+    composite, _ = await make_composite(stub_server, slow, fast, hedge_delay=0.1)
+
+    start = time.perf_counter()
+    assert (await composite.get_transaction_info("abc"))["hash"] == "abc"
+    assert time.perf_counter() - start < 0.5
+    assert len(fast["calls"]) == 1
+
+async def test_paginated_calls_are_not_hedged(stub_server):
+    slow, fast = provider_app(delay=0.2, pages=2), provider_app(pages=2)
+    composite, providers = await make_composite(stub_server, slow, fast, hedge_delay=0.05)
+
+    df = await composite.get_account_transactions("0:aa", limit=2)
+
+    assert list(df["lt"]) == [1, 2, 3, 4]
+    assert fast["calls"] == []
+    # Latency is recorded per page request, not per paginated call
+    assert len(composite._stats[id(providers[0])].latencies) == 3
+
+async def test_toncenter_provider_returns_tonapi_shape(stub_server):
+    async def toncenter_transactions(request):
+        return web.json_response({"transactions": [{
+            "hash": "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=",
+            "lt": "7",
+            "now": 1700000000,
+            "account": "0:AA",
+            "description": {"type": "ord", "aborted": False, "compute_ph": {"success": True}},
+            "in_msg": {"source": "0:BB", "destination": "0:AA", "value": "10", "created_lt": "6"},
+            "out_msgs": []
+        }]})
+
+    app = web.Application()
+    app.router.add_get("/transactions", toncenter_transactions)
+    toncenter = make_explorer(await stub_server(app), ToncenterExplorer, max_attempts=1)
+    composite = CompositeExplorer([make_explorer(await stub_server(provider_app(status=503)), max_attempts=1), toncenter])
+
+    df = await composite.get_account_transactions("0:aa")
+
+    assert df.loc[0, "hash"] == "00" * 32
+    assert df.loc[0, "account_address"] == "0:aa"
+    assert df.loc[0, "in_msg_source_address"] == "0:bb"
+
+async def test_client_error_is_not_failed_over(stub_server):
+    missing, other = provider_app(status=404), provider_app()
+    composite, providers = await make_composite(stub_server, missing, other)
+
+    with pytest.raises(TonClientError):
+        await composite.get_transaction_info("abc")
+    assert other["calls"] == []
+    assert composite._stats[id(providers[0])].consecutive_failures == 0
+
+async def test_demoted_provider_is_tried_again_after_cooldown(stub_server):
+    statuses = [500]
+    flaky_calls = []
+
+    async def flaky(request):
+        status = statuses.pop(0) if statuses else 200
+        flaky_calls.append(status)
+        return web.json_response(transaction(request.match_info["hash"]), status=status)
+
+    app = web.Application()
+    app.router.add_get("/blockchain/transactions/{hash}", flaky)
+    composite = CompositeExplorer(
+        [make_explorer(await stub_server(app), max_attempts=1),
+         make_explorer(await stub_server(provider_app()), max_attempts=1)],
+        failure_cooldown=0.2
+    )
+
+    await composite.get_transaction_info("a")
+    await composite.get_transaction_info("b")
+    assert flaky_calls == [500]
+
+    await asyncio.sleep(0.25)
+    await composite.get_transaction_info("c")
+    assert flaky_calls == [500, 200]
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.graph import CounterpartyGraph
+from src.ton import TonDataError
+from .conftest import FakeDB, make_loader
+
+def chain_graph() -> CounterpartyGraph:
+    """a -> b -> c -> d with 5, 1 and 10 TON."""
+    graph = CounterpartyGraph()
+    graph.add_edges(['a', 'b', 'c'], ['b', 'c', 'd'], [5.0, 1.0, 10.0])
+    graph.compact()
+    return graph
+
+def test_compact_merges_duplicate_edges():
+    graph = CounterpartyGraph()
+    graph.add_edges(['a', 'a', 'a'], ['b', 'b', 'c'], [1.0, 2.0, 4.0])
+    graph.add_edges(['a'], ['b'], [0.5], counts=[3])
+    assert graph.num_edges == 4
+
+    graph.compact()
+
+    assert graph.num_edges == 2
+    assert list(graph.indptr) == [0, 2, 2, 2]
+    top = graph.top_counterparties('a', by='count')
+    assert top.to_dict('records') == [
+        {'address': 'b', 'count': 5, 'volume': 3.5},
+        {'address': 'c', 'count': 1, 'volume': 4.0},
+    ]
+
+def test_k_hop():
+    graph = chain_graph()
+
+    reached = graph.k_hop('a', 3)
+
+    assert list(reached['address']) == ['b', 'c', 'd']
+    assert list(reached['hops']) == [1, 2, 3]
+    assert list(graph.k_hop('a', 1)['address']) == ['b']
+    assert graph.k_hop('unknown', 2).empty
+
+def test_k_hop_min_in_volume():
+    reached = chain_graph().k_hop('a', 3, min_in_volume=2.0)
+
+    assert list(reached['address']) == ['b', 'd']
+    assert list(reached['in_volume']) == [5.0, 10.0]
+
+def test_k_hop_incoming():
+    reached = chain_graph().k_hop('d', 2, direction='in')
+
+    assert list(reached['address']) == ['c', 'b']
+    assert list(reached['hops']) == [1, 2]
+
+def test_queries_see_pending_edges_before_and_after_compact():
+    graph = chain_graph()
+    graph.add_edges(['d', 'e'], ['e', 'b'], [1.0, 7.0])
+    assert graph._delta_size == 2
+
+    for _ in range(2):
+        assert list(graph.k_hop('a', 5)['address']) == ['b', 'c', 'd', 'e']
+        assert list(graph.k_hop('b', 1, direction='in')['address']) == ['a', 'e']
+        assert graph.top_counterparties('e')['address'].tolist() == ['b']
+        assert graph.in_volume[graph.node_id('b')] == 12.0
+        graph.compact()
+
+    assert graph._delta_size == 0
+
+def test_connected_components():
+    graph = CounterpartyGraph()
+    graph.add_edges(['a', 'c', 'x'], ['b', 'b', 'y'], [1.0, 1.0, 1.0])
+
+    labels = graph.connected_components()
+
+    a, b, c, x, y = (graph.node_id(address) for address in 'abcxy')
+    assert labels[a] == labels[b] == labels[c]
+    assert labels[x] == labels[y]
+    assert labels[a] != labels[x]
+    assert sorted(graph.component_members('c')) == ['a', 'b', 'c']
+
+def test_save_over_memory_mapped_graph(tmp_path):
+    chain_graph().save(tmp_path / 'graph')
+    graph = CounterpartyGraph.load(tmp_path / 'graph', mmap=True)
+
+    graph.save(tmp_path / 'graph')
+
+    assert list(graph.k_hop('a', 3)['address']) == ['b', 'c', 'd']
+    assert CounterpartyGraph.load(tmp_path / 'graph').num_edges == 3
+
+def test_save_and_load_mmap_then_add_edges(tmp_path):
+    chain_graph().save(tmp_path / 'graph')
+
+    graph = CounterpartyGraph.load(tmp_path / 'graph', mmap=True)
+    assert isinstance(graph.indices, np.memmap)
+    assert list(graph.k_hop('a', 3)['address']) == ['b', 'c', 'd']
+
+    graph.add_edges(['d', 'a'], ['e', 'b'], [2.0, 1.0])
+    assert list(graph.k_hop('a', 4)['address']) == ['b', 'c', 'd', 'e']
+
+    graph.save(tmp_path / 'graph')
+    updated = CounterpartyGraph.load(tmp_path / 'graph', mmap=False)
+    assert updated.num_nodes == 5
+    assert updated.top_counterparties('a').to_dict('records') == [
+        {'address': 'b', 'count': 2, 'volume': 6.0}
+    ]
+
+def transactions_df(source: str, destinations: list) -> pd.DataFrame:
+    return pd.DataFrame([{
+        'hash': f'tx{i}',
+        'lt': i,
+        'account_address': source,
+        'out_msgs': [{
+            'hash': f'msg{i}',
+            'value': 2_000_000_000,
+            'source': {'address': source},
+            'destination': {'address': destination}
+        }]
+    } for i, destination in enumerate(destinations)])
+
+def test_store_transactions_updates_attached_graph():
+    loader = make_loader("http://127.0.0.1:1", FakeDB())
+    loader.graph = CounterpartyGraph()
+
+    loader.store_transactions(transactions_df('0:aa', ['0:bb', '0:cc', '0:bb']))
+
+    top = loader.graph.top_counterparties('0:aa')
+    assert top.to_dict('records') == [
+        {'address': '0:bb', 'count': 2, 'volume': 4.0},
+        {'address': '0:cc', 'count': 1, 'volume': 2.0},
+    ]
+
+def test_failed_store_does_not_update_graph():
+    loader = make_loader("http://127.0.0.1:1", FakeDB(fail_tables={'out_msgs'}))
+    loader.graph = CounterpartyGraph()
+
+    with pytest.raises(TonDataError):
+        loader.store_transactions(transactions_df('0:aa', ['0:bb']))
+
+    assert loader.graph.num_edges == 0
+
+def test_loader_builds_graph_from_database_then_loads_saved_one(tmp_path):
+    db = FakeDB()
+    db.get_counterparty_edges = lambda: iter([pd.DataFrame({
+        'source_address': ['0:aa'], 'destination_address': ['0:bb'], 'count': [2], 'volume': [3.0]
+    })])
+    loader = make_loader("http://127.0.0.1:1", db)
+
+    graph = loader._open_graph(str(tmp_path / 'graph'))
+    assert graph.top_counterparties('0:aa').to_dict('records') == [
+        {'address': '0:bb', 'count': 2, 'volume': 3.0}
+    ]
+
+    graph.add_edges(['0:bb'], ['0:cc'], [1.0])
+    graph.save(tmp_path / 'graph')
+    db.get_counterparty_edges = None
+
+    reopened = loader._open_graph(str(tmp_path / 'graph'))
+    assert list(reopened.k_hop('0:aa', 2)['address']) == ['0:bb', '0:cc']
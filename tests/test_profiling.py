@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pandas as pd
+from aiohttp import web
+
+from src.utils.profiling import Profiler, profile_address, profile_stage
+from .conftest import make_explorer
+
+async def test_network_and_retry_wait_are_separate_stages(stub_server):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return web.json_response({}, status=503)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/flaky", handler)
+    explorer = make_explorer(await stub_server(app))
+
+    with Profiler() as profiler:
+        assert await explorer._make_request("flaky") == {"ok": True}
+
+    stages = profiler.to_dataframe().groupby('stage')['calls'].sum()
+    assert stages['network'] == 2
+    assert stages['retry_wait'] == 1
+
+async def test_stages_are_attributed_to_concurrent_addresses():
+    async def process(address: str, delay: float) -> None:
+        with profile_address(address):
+            with profile_stage("network"):
+                await asyncio.sleep(delay)
+            with profile_stage("upload"):
+                pass
+
+    with Profiler() as profiler:
+        await asyncio.gather(process("a", 0.05), process("b", 0.01))
+        with profile_stage("report"):
+            pass
+
+    df = profiler.to_dataframe().set_index(['stage', 'address'])
+    assert sorted(df.index) == [
+        ('network', 'a'), ('network', 'b'), ('report', '-'), ('upload', 'a'), ('upload', 'b')
+    ]
+    assert (df['calls'] == 1).all()
+    assert df.loc[('network', 'a'), 'wall_time'] > df.loc[('network', 'b'), 'wall_time']
+
+def test_report_ranks_slowest_stages_and_addresses():
+    with Profiler() as profiler:
+        for address, delay in [("fast", 0.0), ("slow", 0.03), ("medium", 0.01)]:
+            with profile_address(address):
+                with profile_stage("prepare_transactions"):
+                    time.sleep(delay / 3)
+                with profile_stage("upload"):
+                    time.sleep(delay)
+
+    stages, addresses = profiler.report(top_n=2).split("\n\n")
+    stage_rows = [line.split()[0] for line in stages.splitlines()[3:]]
+    address_rows = [line.split()[0] for line in addresses.splitlines()[3:]]
+
+    assert stage_rows == ["upload", "prepare_transactions"]
+    assert address_rows == ["slow", "medium"]
+    assert "Slowest 2 addresses" in addresses
+
+async def test_memory_peaks_skip_overlapping_stages():
+    async def allocate(address: str) -> None:
+        with profile_address(address), profile_stage("overlapping"):
+            data = bytearray(2**20)
+            await asyncio.sleep(0.01)
+            del data
+
+    with Profiler(trace_memory=True) as profiler:
+        await asyncio.gather(allocate("a"), allocate("b"))
+        with profile_address("c"), profile_stage("alone"):
+            data = bytearray(2**20)
+            del data
+        df = profiler.to_dataframe().set_index('stage')
+
+    assert profiler.overlapped_stages == 2
+    assert df.loc['overlapping', 'peak_memory_mb'].isna().all()
+    assert df.loc['alone', 'peak_memory_mb'] > 0.9
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.ton import TonClientError, TonCircuitOpenError
+from src.ton.retry import CircuitBreaker, parse_retry_after
+from .conftest import make_explorer
+
+async def test_client_error_fails_fast(stub_server):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return web.json_response({}, status=404)
+
+    app = web.Application()
+    app.router.add_get("/missing", handler)
+    explorer = make_explorer(await stub_server(app))
+
+    with pytest.raises(TonClientError):
+        await explorer._make_request("missing")
+    assert len(calls) == 1
+
+async def test_retry_after_is_capped(stub_server):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return web.json_response({}, status=429, headers={"Retry-After": "3600"})
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/limited", handler)
+    explorer = make_explorer(await stub_server(app))
+
+    assert await asyncio.wait_for(explorer._make_request("limited"), 5) == {"ok": True}
+    assert len(calls) == 2
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+@pytest.mark.parametrize("trial", ["cancelled", "rate_limited", "bad_json"])
+async def test_breaker_recovers_after_inconclusive_trial(stub_server, trial):
+    healthy = asyncio.Event()
+
+    async def handler(request):
+        if healthy.is_set():
+            return web.json_response({"ok": True})
+        if trial == "cancelled":
+            await asyncio.sleep(1)
+        if trial == "rate_limited":
+            return web.json_response({}, status=429, headers={"Retry-After": "0"})
+        return web.Response(text="{not json", content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/api", handler)
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    explorer = make_explorer(await stub_server(app), circuit_breaker=breaker, max_attempts=1)
+
+    breaker.record_failure()
+    await asyncio.sleep(0.06)
+
+    if trial == "cancelled":
+        task = asyncio.create_task(explorer._make_request("api"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    else:
+        with pytest.raises(Exception):
+            await explorer._make_request("api")
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(TonCircuitOpenError):
+        await explorer._make_request("api")
+
+    healthy.set()
+    await asyncio.sleep(0.06)
+    assert await explorer._make_request("api") == {"ok": True}
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,174 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from src.ton import TransactionStreamer
+from .conftest import FakeDB, make_explorer, make_loader
+
+ACCOUNT = "0:" + "ab" * 32
+
+def sse_event(event: str, data=None) -> bytes:
+    payload = f"event: {event}\n"
+    if data is not None:
+        payload += f"data: {json.dumps(data)}\n"
+    return (payload + "\n").encode()
+
+def tx_event(lt: int) -> bytes:
+    return sse_event("message", {"account_id": ACCOUNT, "lt": lt, "tx_hash": f"tx{lt}"})
+
+def transaction(lt: int) -> dict:
+    return {
+        "hash": f"tx{lt}",
+        "lt": lt,
+        "account": {"address": ACCOUNT},
+        "out_msgs": [{"hash": f"msg{lt}", "value": 1, "destination": {"address": "0:bb"}}]
+    }
+
+class StubChain:
+    """Stub tonapi with committed transactions and scripted SSE connections."""
+
+    def __init__(self, committed, sessions):
+        self.committed = list(committed)
+        self.sessions = list(sessions)
+        self.connections = 0
+
+    async def sse(self, request):
+        self.connections += 1
+        session = self.sessions.pop(0) if self.sessions else None
+        if session is None:
+            return web.Response(status=503)
+        if "before_open" in session:
+            self.committed.extend(session["before_open"])
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for lt in session.get("events", []):
+            if lt not in self.committed:
+                self.committed.append(lt)
+            await response.write(tx_event(lt))
+        await asyncio.sleep(session.get("hold", 0))
+        return response
+
+    async def account_transactions(self, request):
+        after_lt = int(request.query["after_lt"])
+        return web.json_response({
+            "transactions": [transaction(lt) for lt in sorted(self.committed) if lt > after_lt]
+        })
+
+    async def transaction(self, request):
+        return web.json_response(transaction(int(request.match_info["hash"][2:])))
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/sse/accounts/transactions", self.sse)
+        app.router.add_get("/blockchain/accounts/{address}/transactions", self.account_transactions)
+        app.router.add_get("/blockchain/transactions/{hash}", self.transaction)
+        return app
+
+def stored_lts(db: FakeDB) -> list:
+    return [lt for df in db.uploaded("transactions") for lt in df["lt"]]
+
+def make_streamer(base_url: str, db: FakeDB, **kwargs) -> TransactionStreamer:
+    db.last_lts[ACCOUNT] = 5
+    loader = make_loader(base_url, db)
+    return TransactionStreamer(loader.explorer, loader, [ACCOUNT], **kwargs)
+
+async def run_until(streamer: TransactionStreamer, condition, timeout: float = 5.0) -> None:
+    async def wait_for_condition() -> None:
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(streamer.run())
+    try:
+        await asyncio.wait_for(wait_for_condition(), timeout)
+    finally:
+        streamer.stop()
+        await asyncio.wait_for(task, 5)
+
+async def test_sse_parsing(stub_server):
+    async def handler(request):
+        assert request.query["accounts"] == "a,b"
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b": comment\n\nevent: heartbeat\n\n")
+        await response.write(b'id: 1\ndata: {"lt": 1,\ndata:  "tx_hash": "h"}\n\n')
+        await response.write(b"event: custom\ndata: plain text\n\n")
+        return response
+
+    app = web.Application()
+    app.router.add_get("/sse/accounts/transactions", handler)
+    explorer = make_explorer(await stub_server(app))
+
+    events = [event async for event in explorer.stream_account_transactions(["a", "b"])]
+
+    assert events == [
+        {"event": "open", "data": None},
+        {"event": "heartbeat", "data": None},
+        {"event": "message", "data": {"lt": 1, "tx_hash": "h"}},
+        {"event": "custom", "data": "plain text"},
+    ]
+
+async def test_reconnect_backfills_gap_without_duplicates(stub_server):
+    chain = StubChain(committed=[5, 6], sessions=[
+        {"events": [7, 8]},
+        # Committed while disconnected, then replayed and new events
+        {"before_open": [9], "events": [8, 9, 10]},
+    ])
+    db = FakeDB()
+    streamer = make_streamer(
+        await stub_server(chain.app()), db, flush_interval=0.0, reconnect_delay=0.01
+    )
+
+    await run_until(streamer, lambda: 10 in stored_lts(db))
+
+    assert sorted(stored_lts(db)) == [6, 7, 8, 9, 10]
+    assert streamer.last_lts[ACCOUNT] == 10
+
+async def test_transactions_committed_before_subscription_are_not_lost(stub_server):
+    # lt 6 is committed while the subscription is being opened and is never streamed
+    chain = StubChain(committed=[5], sessions=[{"before_open": [6], "events": [7], "hold": 1}])
+    db = FakeDB()
+    streamer = make_streamer(await stub_server(chain.app()), db, flush_interval=0.0)
+
+    await run_until(streamer, lambda: 7 in stored_lts(db))
+
+    assert sorted(stored_lts(db)) == [6, 7]
+
+async def test_buffer_is_flushed_on_timer_in_quiet_periods(stub_server):
+    chain = StubChain(committed=[5], sessions=[{"events": [6], "hold": 1}])
+    db = FakeDB()
+    streamer = make_streamer(await stub_server(chain.app()), db, batch_size=100, flush_interval=0.1)
+
+    await run_until(streamer, lambda: 6 in stored_lts(db), timeout=1.0)
+
+    assert chain.connections == 1
+
+async def test_failed_store_does_not_advance_last_lt(stub_server):
+    chain = StubChain(committed=[5], sessions=[{"events": [6], "hold": 1}])
+    db = FakeDB(fail_tables={"transactions"})
+    streamer = make_streamer(await stub_server(chain.app()), db, flush_interval=0.0, reconnect_delay=5)
+
+    await run_until(streamer, lambda: db.failed_uploads > 0, timeout=2.0)
+
+    assert streamer.last_lts[ACCOUNT] == 5
+
+async def test_retry_after_failed_out_msgs_stores_transactions_once(stub_server):
+    # Transactions are written before out_msgs fails, then the backfill after
+    # reconnecting fetches the same transactions again
+    chain = StubChain(committed=[5], sessions=[{"events": [6], "hold": 1}, {"hold": 1}])
+    db = FakeDB(fail_tables={"out_msgs"})
+    streamer = make_streamer(await stub_server(chain.app()), db, flush_interval=0.0, reconnect_delay=0.01)
+
+    def stored_after_failure() -> bool:
+        if db.failed_uploads:
+            db.fail_tables.clear()
+        return 6 in stored_lts(db)
+
+    await run_until(streamer, stored_after_failure)
+
+    assert db.failed_uploads == 1
+    assert list(db.rows("transactions")["lt"]) == [6]
+    assert list(db.rows("out_msgs")["hash"]) == ["msg6"]
+    assert streamer.last_lts[ACCOUNT] == 6
@@ -0,0 +1,98 @@
+from aiohttp import web
+
+from src.ton import ToncenterExplorer, TonClientError
+from src.ton.loader import TransactionLoader
+from src.ton.mapping import DEFAULT_TRANSACTION_COLUMNS, DEFAULT_OUT_MSG_COLUMNS
+from .conftest import make_explorer
+
+import pytest
+
+TONCENTER_TX = {
+    "hash": "q83vEjRWeJCrze8SNFZ4kKvN7xI0VniQq83vEjRWeJA=",
+    "lt": "47000000000002",
+    "now": 1700000000,
+    "account": "0:AAAA",
+    "orig_status": "active",
+    "end_status": "active",
+    "total_fees": "1000",
+    "account_state_after": {"balance": "5000000000"},
+    "description": {"type": "ord", "aborted": False, "compute_ph": {"success": True}},
+    "in_msg": {
+        "hash": "q83vEjRWeJCrze8SNFZ4kKvN7xI0VniQq83vEjRWeJA=",
+        "source": "0:BBBB",
+        "destination": "0:AAAA",
+        "value": "2000000000",
+        "fwd_fee": "10",
+        "ihr_fee": "0",
+        "created_lt": "47000000000001",
+        "opcode": "0x00000000",
+        "bounce": False,
+        "message_content": {"decoded": {"type": "text_comment", "comment": "hi"}}
+    },
+    "out_msgs": [{
+        "hash": "q83vEjRWeJCrze8SNFZ4kKvN7xI0VniQq83vEjRWeJA=",
+        "source": "0:AAAA",
+        "destination": "0:CCCC",
+        "value": "1000000000",
+        "fwd_fee": "10",
+        "ihr_fee": "0",
+        "created_lt": "47000000000003",
+        "bounce": True
+    }, {
+        "hash": "q83vEjRWeJCrze8SNFZ4kKvN7xI0VniQq83vEjRWeJA=",
+        "source": "0:AAAA",
+        "destination": None,
+        "created_lt": "47000000000004"
+    }]
+}
+
+async def toncenter_url(stub_server, requests=None, transactions=(TONCENTER_TX,)):
+    async def handler(request):
+        if requests is not None:
+            requests.append(dict(request.query))
+        return web.json_response({"transactions": list(transactions)})
+
+    app = web.Application()
+    app.router.add_get("/transactions", handler)
+    return await stub_server(app)
+
+async def test_transactions_have_tonapi_columns(stub_server):
+    explorer = make_explorer(await toncenter_url(stub_server), ToncenterExplorer)
+    loader = TransactionLoader(explorer)
+
+    df = await explorer.get_account_transactions("0:aaaa")
+    tx_df = loader._prepare_transaction_df(df)
+    out_msgs_df = loader._prepare_out_msg_df(df)
+
+    assert set(tx_df.columns) == set(DEFAULT_TRANSACTION_COLUMNS) - {
+        'account_is_scam', 'account_is_wallet', 'wallet_address', 'in_msg_source_name'
+    }
+    assert set(out_msgs_df.columns) == set(DEFAULT_OUT_MSG_COLUMNS) - {'decoded_op_name', 'decoded_body_text'}
+
+    row = tx_df.iloc[0]
+    assert row['hash'] == "abcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890"
+    assert row['lt'] == 47000000000002
+    assert row['success']
+    assert row['transaction_type'] == 'TransOrd'
+    assert row['account_address'] == '0:aaaa'
+    assert row['end_balance'] == 5000000000
+    assert row['in_msg_msg_type'] == 'int_msg'
+    assert row['in_msg_source_address'] == '0:bbbb'
+    assert row['in_msg_decoded_body_text'] == 'hi'
+    assert list(out_msgs_df['msg_type']) == ['int_msg', 'ext_out_msg']
+    assert out_msgs_df.iloc[0]['destination_address'] == '0:cccc'
+
+async def test_pagination_starts_after_lt(stub_server):
+    requests = []
+    explorer = make_explorer(await toncenter_url(stub_server, requests), ToncenterExplorer)
+
+    await explorer.get_account_transactions("0:aaaa", limit=10, after_lt=100)
+
+    assert requests[0]["start_lt"] == "101"
+    assert requests[0]["sort"] == "asc"
+
+async def test_missing_transaction_is_client_error(stub_server):
+    explorer = make_explorer(await toncenter_url(stub_server, transactions=()), ToncenterExplorer)
+
+    with pytest.raises(TonClientError):
+        await explorer.get_transaction_info("abc")